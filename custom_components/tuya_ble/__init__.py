@@ -3,32 +3,33 @@ from __future__ import annotations
 
 import logging
 
-from bleak_retry_connector import BLEAK_RETRY_EXCEPTIONS as BLEAK_EXCEPTIONS, get_device
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BLEAK_RETRY_EXCEPTIONS as BLEAK_EXCEPTIONS
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.match import ADDRESS, BluetoothCallbackMatcher
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ADDRESS, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.const import CONF_ADDRESS, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Event, HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
 
-from .tuya_ble import TuyaBLEDevice
+from .tuya_ble import AbstaractTuyaBLEDeviceManager, TuyaBLEDevice
 
 from .cloud import HASSTuyaBLEDeviceManager
-from .const import DOMAIN
+from .const import (
+    CONF_CREDENTIALS_PATH,
+    CONF_OPTIMISTIC,
+    CONF_PREFETCH_CREDENTIALS,
+    CONF_STARTUP_RAMP,
+    DOMAIN,
+    NO_RSSI_VALUE,
+    STARTUP_RAMP,
+)
 from .devices import TuyaBLECoordinator, TuyaBLEData, get_device_product_info
-
-PLATFORMS: list[Platform] = [
-    Platform.BUTTON,
-    Platform.CLIMATE,
-    Platform.NUMBER,
-    Platform.SENSOR,
-    Platform.BINARY_SENSOR,
-    Platform.SELECT,
-    Platform.SWITCH,
-    Platform.TEXT,
-    Platform.COVER,
-]
+from .offline import get_offline_manager
+from .prefetch import async_update_prefetcher
+from .registry import get_device_platforms
+from .restore import get_datapoints_store
+from .startup import async_cancel_device_startup, async_plan_device_startup
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,17 +39,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     address: str = entry.data[CONF_ADDRESS]
     ble_device = bluetooth.async_ble_device_from_address(
         hass, address.upper(), True
-    ) or await get_device(address)
-    if not ble_device:
-        raise ConfigEntryNotReady(
-            f"Could not find Tuya BLE device with address {address}"
+    )
+    attached = ble_device is not None
+    if not attached:
+        # Do not hold up the setup with a scan, the device is attached
+        # when the bluetooth callback sees the address first time.
+        _LOGGER.debug("%s: Device not found, deferring attach", address)
+        ble_device = BLEDevice(
+            address.upper(), None, None, rssi=NO_RSSI_VALUE
         )
-    manager = HASSTuyaBLEDeviceManager(hass, entry.options.copy())
+    manager: AbstaractTuyaBLEDeviceManager
+    if credentials_path := entry.options.get(CONF_CREDENTIALS_PATH):
+        manager = get_offline_manager(hass, credentials_path)
+    else:
+        manager = HASSTuyaBLEDeviceManager(hass, entry.options.copy(), entry)
     device = TuyaBLEDevice(manager, ble_device)
     await device.initialize()
+    datapoints_store = get_datapoints_store(hass)
+    restored = await datapoints_store.async_restore(device)
     product_info = get_device_product_info(device)
 
     coordinator = TuyaBLECoordinator(hass, device)
+    coordinator.optimistic = entry.options.get(CONF_OPTIMISTIC, False)
+    if restored:
+        coordinator.async_set_restored()
+    entry.async_on_unload(
+        device.register_callback(lambda _: datapoints_store.async_schedule_save())
+    )
 
     '''
     try:
@@ -58,7 +75,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"Could not communicate with Tuya BLE device with address {address}"
         ) from ex
     '''
-    hass.add_job(device.update())
+
+    @callback
+    def _async_plan_startup() -> None:
+        async_plan_device_startup(
+            hass,
+            entry.entry_id,
+            device,
+            entry.options.get(CONF_STARTUP_RAMP, STARTUP_RAMP),
+        )
+
+    if attached:
+        _async_plan_startup()
 
     @callback
     def _async_update_ble(
@@ -66,9 +94,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         change: bluetooth.BluetoothChange,
     ) -> None:
         """Update from a ble callback."""
+        nonlocal attached
         device.set_ble_device_and_advertisement_data(
             service_info.device, service_info.advertisement
         )
+        if not attached:
+            attached = True
+            _LOGGER.debug("%s: Device found, attaching", address)
+            _async_plan_startup()
 
     entry.async_on_unload(
         bluetooth.async_register_callback(
@@ -79,16 +112,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
 
+    platforms = get_device_platforms(device)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = TuyaBLEData(
         entry.title,
         device,
         product_info,
         manager,
         coordinator,
+        platforms,
     )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    async_update_prefetcher(
+        hass, entry.entry_id, entry.options.get(CONF_PREFETCH_CREDENTIALS, False)
+    )
 
     async def _async_stop(event: Event) -> None:
         """Close the connection."""
@@ -103,14 +141,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     data: TuyaBLEData = hass.data[DOMAIN][entry.entry_id]
-    if entry.title != data.title:
+    if (
+        entry.title != data.title
+        or entry.options.get(CONF_OPTIMISTIC, False) != data.coordinator.optimistic
+    ):
         await hass.config_entries.async_reload(entry.entry_id)
+    else:
+        async_update_prefetcher(
+            hass, entry.entry_id, entry.options.get(CONF_PREFETCH_CREDENTIALS, False)
+        )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        data: TuyaBLEData = hass.data[DOMAIN].pop(entry.entry_id)
+    data: TuyaBLEData = hass.data[DOMAIN][entry.entry_id]
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, data.platforms
+    ):
+        hass.data[DOMAIN].pop(entry.entry_id)
         await data.device.stop()
+        async_update_prefetcher(hass, entry.entry_id, False)
+        async_cancel_device_startup(hass, entry.entry_id)
+        await get_datapoints_store(hass).async_remove_device(
+            data.device.address, True
+        )
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove a config entry."""
+    await get_datapoints_store(hass).async_remove_device(
+        entry.data[CONF_ADDRESS].upper(), False
+    )
@@ -12,6 +12,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -21,6 +22,7 @@ from .const import (
     DOMAIN,
 )
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -70,18 +72,10 @@ mapping: dict[str, TuyaBLECategoryBinarySensorMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLEBinarySensorMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLEBinarySensorMapping, ...]:
+    return get_device_mappings(device, Platform.BINARY_SENSOR)
 
 
 class TuyaBLEBinarySensor(TuyaBLEEntity, BinarySensorEntity):
@@ -130,7 +124,7 @@ class TuyaBLEBinarySensor(TuyaBLEEntity, BinarySensorEntity):
                 else:
                     self._attr_native_value = datapoint.value
                 '''
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def available(self) -> bool:
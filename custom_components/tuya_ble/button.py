@@ -11,12 +11,14 @@ from homeassistant.components.button import (
     ButtonEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -112,18 +114,10 @@ mapping: dict[str, TuyaBLECategoryButtonMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLECategoryButtonMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLECategoryButtonMapping, ...]:
+    return get_device_mappings(device, Platform.BUTTON)
 
 
 class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
@@ -140,7 +134,7 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Press the button."""
         datapoint = self._device.datapoints.get_or_create(
             self._mapping.dp_id,
@@ -148,7 +142,10 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
             False,
         )
         if datapoint:
-            self._hass.create_task(datapoint.set_value(not bool(datapoint.value)))
+            # Buttons are momentary, devices do not report them back
+            await self._async_set_datapoint(
+                datapoint, not bool(datapoint.value), track_echo=False
+            )
 
     @property
     def available(self) -> bool:
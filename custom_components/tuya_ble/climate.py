@@ -18,13 +18,19 @@ from homeassistant.components.climate.const import (
     PRESET_NONE,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    TuyaBLEValueThrottle,
+)
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,6 +64,11 @@ class TuyaBLEClimateMapping:
     target_humidity_max: float = 100.0
     target_humidity_min: float = 0.0
 
+    # Throttling of current temperature and humidity
+    deadband: float = 0
+    deadband_percent: bool = False
+    min_interval: float = 0
+
 
 @dataclass
 class TuyaBLECategoryClimateMapping:
@@ -124,6 +135,8 @@ mapping: dict[str, TuyaBLECategoryClimateMapping] = {
                     target_temperature_dp_id=103,
                     target_temperature_min=5.0,
                     target_temperature_max=30.0,
+                    deadband=0.2,
+                    min_interval=30,
                     ),
                 ],
             ),
@@ -132,18 +145,10 @@ mapping: dict[str, TuyaBLECategoryClimateMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLECategoryClimateMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLECategoryClimateMapping, ...]:
+    return get_device_mappings(device, Platform.CLIMATE)
 
 
 class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
@@ -184,61 +189,114 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
             self._attr_max_humidity = mapping.target_humidity_max
             self._attr_min_humidity = mapping.target_humidity_min
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-
-        if self._mapping.current_temperature_dp_id != 0:
-            datapoint = self._device.datapoints[self._mapping.current_temperature_dp_id]
-            if datapoint:
-                self._attr_current_temperature = (
-                    datapoint.value / self._mapping.current_temperature_coefficient
+        self._decoders = self._compile_decoders()
+
+    def _compile_decoders(self) -> list[Callable[[], None]]:
+        """Builds decoders for datapoints configured in the mapping only."""
+        mapping = self._mapping
+        datapoints = self._device.datapoints
+        decoders: list[Callable[[], None]] = []
+
+        def _make_scaled(
+            dp_id: int, coefficient: float, attr: str, throttled: bool = False
+        ) -> None:
+            throttle: TuyaBLEValueThrottle | None = None
+            if throttled and (mapping.deadband or mapping.min_interval):
+
+                @callback
+                def _async_publish(value: float) -> None:
+                    setattr(self, attr, value)
+                    self.async_write_ha_state_if_changed()
+
+                throttle = TuyaBLEValueThrottle(
+                    self._hass,
+                    mapping.deadband,
+                    mapping.deadband_percent,
+                    mapping.min_interval,
+                    _async_publish,
                 )
+                self.async_on_remove(throttle.async_cancel)
+
+            def _decode() -> None:
+                datapoint = datapoints[dp_id]
+                if datapoint:
+                    value = datapoint.value / coefficient
+                    if throttle is None or throttle.async_update(value):
+                        setattr(self, attr, value)
+
+            decoders.append(_decode)
+
+        if mapping.current_temperature_dp_id != 0:
+            _make_scaled(
+                mapping.current_temperature_dp_id,
+                mapping.current_temperature_coefficient,
+                "_attr_current_temperature",
+                True,
+            )
+        if mapping.target_temperature_dp_id != 0:
+            _make_scaled(
+                mapping.target_temperature_dp_id,
+                mapping.target_temperature_coefficient,
+                "_attr_target_temperature",
+            )
+        if mapping.current_humidity_dp_id != 0:
+            _make_scaled(
+                mapping.current_humidity_dp_id,
+                mapping.current_humidity_coefficient,
+                "_attr_current_humidity",
+                True,
+            )
+        if mapping.target_humidity_dp_id != 0:
+            _make_scaled(
+                mapping.target_humidity_dp_id,
+                mapping.target_humidity_coefficient,
+                "_attr_target_humidity",
+            )
 
-        if self._mapping.target_temperature_dp_id != 0:
-            datapoint = self._device.datapoints[self._mapping.target_temperature_dp_id]
-            if datapoint:
-                self._attr_target_temperature = (
-                    datapoint.value / self._mapping.target_temperature_coefficient
-                )
+        if mapping.hvac_mode_dp_id != 0 and mapping.hvac_modes:
+            hvac_mode_dp_id = mapping.hvac_mode_dp_id
+            hvac_modes = dict(enumerate(mapping.hvac_modes))
+
+            def _decode_hvac_mode() -> None:
+                datapoint = datapoints[hvac_mode_dp_id]
+                if datapoint:
+                    self._attr_hvac_mode = hvac_modes.get(datapoint.value)
+
+            decoders.append(_decode_hvac_mode)
+        elif mapping.hvac_switch_dp_id != 0 and mapping.hvac_switch_mode:
+            hvac_switch_dp_id = mapping.hvac_switch_dp_id
+            hvac_switch_mode = mapping.hvac_switch_mode
+
+            def _decode_hvac_switch() -> None:
+                datapoint = datapoints[hvac_switch_dp_id]
+                if datapoint:
+                    self._attr_hvac_mode = (
+                        hvac_switch_mode if datapoint.value else HVACMode.OFF
+                    )
 
-        if self._mapping.current_humidity_dp_id != 0:
-            datapoint = self._device.datapoints[self._mapping.current_humidity_dp_id]
-            if datapoint:
-                self._attr_current_humidity = (
-                    datapoint.value / self._mapping.current_humidity_coefficient
-                )
+            decoders.append(_decode_hvac_switch)
 
-        if self._mapping.target_humidity_dp_id != 0:
-            datapoint = self._device.datapoints[self._mapping.target_humidity_dp_id]
-            if datapoint:
-                self._attr_target_humidity = (
-                    datapoint.value / self._mapping.target_humidity_coefficient
-                )
+        if mapping.preset_mode_dp_ids:
+            preset_mode_dp_ids = tuple(mapping.preset_mode_dp_ids.items())
 
-        if self._mapping.hvac_mode_dp_id != 0 and self._mapping.hvac_modes:
-            datapoint = self._device.datapoints[self._mapping.hvac_mode_dp_id]
-            if datapoint:
-                self._attr_hvac_mode = (
-                    self._mapping.hvac_modes[datapoint.value]
-                    if datapoint.value < len(self._mapping.hvac_modes)
-                    else None
-                )
-        elif self._mapping.hvac_switch_dp_id != 0 and self._mapping.hvac_switch_mode:
-            datapoint = self._device.datapoints[self._mapping.hvac_switch_dp_id]
-            if datapoint:
-                self._attr_hvac_mode = (
-                    self._mapping.hvac_switch_mode if datapoint.value else HVACMode.OFF
-                )
+            def _decode_preset_mode() -> None:
+                current_preset_mode = PRESET_NONE
+                for preset_mode, dp_id in preset_mode_dp_ids:
+                    datapoint = datapoints[dp_id]
+                    if datapoint and datapoint.value:
+                        current_preset_mode = preset_mode
+                        break
+                self._attr_preset_mode = current_preset_mode
 
-        if self._mapping.preset_mode_dp_ids:
-            current_preset_mode = PRESET_NONE
-            for preset_mode, dp_id in self._mapping.preset_mode_dp_ids.items():
-                datapoint = self._device.datapoints[dp_id]
-                if datapoint and datapoint.value:
-                    current_preset_mode = preset_mode
-                    break
-            self._attr_preset_mode = current_preset_mode
+            decoders.append(_decode_preset_mode)
+
+        return decoders
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        for decoder in self._decoders:
+            decoder()
 
         try:
             if (
@@ -252,7 +310,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
         except:
             pass
 
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
@@ -266,7 +324,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
                 int_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(int_value))
+                await self._async_set_datapoint(datapoint, int_value)
 
     async def async_set_humidity(self, humidity: int) -> None:
         """Set new target humidity."""
@@ -278,7 +336,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
                 int_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(int_value))
+                await self._async_set_datapoint(datapoint, int_value)
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
@@ -294,7 +352,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
                 int_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(int_value))
+                await self._async_set_datapoint(datapoint, int_value)
         elif self._mapping.hvac_switch_dp_id != 0 and self._mapping.hvac_switch_mode:
             bool_value = hvac_mode == self._mapping.hvac_switch_mode
             datapoint = self._device.datapoints.get_or_create(
@@ -303,7 +361,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
                 bool_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(bool_value))
+                await self._async_set_datapoint(datapoint, bool_value)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
@@ -338,7 +396,7 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
                             bool_value,
                         )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(bool_value))
+                await self._async_set_datapoint(datapoint, bool_value)
 
 
 async def async_setup_entry(
@@ -1,11 +1,16 @@
 """The Tuya BLE integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
-from typing import Any, Iterable
+import time
+from typing import Any, Callable, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from homeassistant.const import (
     CONF_ADDRESS,
@@ -14,11 +19,13 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_USERNAME,
 )
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.components.tuya.const import (
     CONF_APP_TYPE,
     CONF_ENDPOINT,
     DOMAIN as TUYA_DOMAIN,
+    TUYA_RESPONSE_CODE,
     TUYA_RESPONSE_RESULT,
     TUYA_RESPONSE_SUCCESS,
 )
@@ -49,7 +56,10 @@ from .const import (
     CONF_PRODUCT_ID,
     CONF_DEVICE_NAME,
     CONF_PRODUCT_NAME,
+    DATA_CLOUD_TRANSPORT,
     DOMAIN,
+    PREFETCH_REFRESH_INTERVAL,
+    TUYA_API_DEVICE_URL,
     TUYA_API_DEVICES_URL,
     TUYA_API_FACTORY_INFO_URL,
     TUYA_FACTORY_INFO_MAC,
@@ -60,16 +70,38 @@ from .const import (
     CONF_ACCESS_SECRET,
     CONF_AUTH_TYPE,
     SMARTLIFE_APP,
+    TUYA_API_BURST,
+    TUYA_API_POOL_SIZE,
+    TUYA_API_RATE,
+    TUYA_API_RETRIES,
+    TUYA_API_RETRY_CODES,
+    TUYA_API_RETRY_DELAY,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class TuyaPooledOpenAPI(TuyaOpenAPI):
+    """Tuya OpenAPI client using the pooled HTTP session of the transport."""
+
+    def __init__(self, session: requests.Session, *args: Any, **kwargs: Any) -> None:
+        # TuyaOpenAPI has no way to pass a session in, it always creates its
+        # own one, so every login would open new connections to the cloud.
+        # Replace it right after init, before any request is sent.
+        super().__init__(*args, **kwargs)
+        self.session.close()
+        self.session = session
+
+
 @dataclass
 class TuyaCloudCacheItem:
     api: TuyaOpenAPI | None
     login: dict[str, Any]
     credentials: dict[str, dict[str, Any]]
+    # device_id -> local_key of every device seen in the account
+    device_keys: dict[str, str | None] = field(default_factory=dict)
+    # device_id -> MAC address of the BLE devices
+    device_macs: dict[str, str] = field(default_factory=dict)
 
 
 CONF_TUYA_LOGIN_KEYS = [
@@ -95,15 +127,178 @@ CONF_TUYA_DEVICE_KEYS = [
 ]
 
 _cache: dict[str, TuyaCloudCacheItem] = {}
+_last_prefetch_refresh: float | None = None
+
+
+@dataclass
+class TuyaCloudCallStats:
+    """Statistics of calls made to the Tuya cloud for a single account."""
+
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class TuyaCloudRateLimiter:
+    """Token bucket limiting the rate of calls made for a single account."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self._burst),
+                    self._tokens + (now - self._updated) * self._rate,
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+
+class TuyaCloudTransport:
+    """Rate limited transport for the Tuya OpenAPI calls.
+
+    All accounts share one pooled HTTP session, so keep-alive connections
+    are reused between calls. Calls are rate limited per account and retried
+    with backoff when the cloud reports a quota or server error.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=TUYA_API_POOL_SIZE,
+            pool_maxsize=TUYA_API_POOL_SIZE,
+        )
+        self._session.mount("https://", adapter)
+        self._limiters: dict[str, TuyaCloudRateLimiter] = {}
+        self._stats: dict[str, TuyaCloudCallStats] = {}
+
+    @staticmethod
+    def get_account_key(data: dict[str, Any]) -> str:
+        return "%s@%s" % (data.get(CONF_USERNAME, ""), data.get(CONF_ACCESS_ID, ""))
+
+    @staticmethod
+    def _should_retry(response: dict[Any, Any]) -> bool:
+        if response.get(TUYA_RESPONSE_SUCCESS, False):
+            return False
+        return response.get(TUYA_RESPONSE_CODE) in TUYA_API_RETRY_CODES
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled HTTP session shared by all API clients."""
+        return self._session
+
+    async def async_call(
+        self,
+        account: str,
+        func: Callable[..., dict[str, Any]],
+        *args: Any,
+    ) -> dict[str, Any]:
+        """Call blocking API function in the executor."""
+        limiter = self._limiters.get(account)
+        if limiter is None:
+            limiter = TuyaCloudRateLimiter(TUYA_API_RATE, TUYA_API_BURST)
+            self._limiters[account] = limiter
+        stats = self._stats.setdefault(account, TuyaCloudCallStats())
+
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            started = time.monotonic()
+            response: dict[str, Any] | None = None
+            error: Exception | None = None
+            try:
+                response = await self._hass.async_add_executor_job(func, *args)
+            except (requests.RequestException, ValueError) as ex:
+                error = ex
+            elapsed = time.monotonic() - started
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+            if response is not None and not self._should_retry(response):
+                return response
+            if attempt >= TUYA_API_RETRIES:
+                stats.failures += 1
+                if error is not None:
+                    raise error
+                return response
+
+            delay = TUYA_API_RETRY_DELAY * (2**attempt)
+            attempt += 1
+            stats.retries += 1
+            _LOGGER.debug(
+                "Tuya cloud call failed (%s), retrying in %ss",
+                error if error is not None else response.get(TUYA_RESPONSE_CODE),
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def async_get(
+        self,
+        account: str,
+        api: TuyaOpenAPI,
+        path: str,
+    ) -> dict[str, Any]:
+        return await self.async_call(account, api.get, path)
+
+    @property
+    def stats(self) -> dict[str, TuyaCloudCallStats]:
+        return self._stats
+
+    def log_stats(self) -> None:
+        for account, stats in self._stats.items():
+            _LOGGER.debug(
+                "Tuya cloud calls for %s: %s calls, %s retries, %s failures, "
+                "average %.3f s, max %.3f s",
+                account,
+                stats.calls,
+                stats.retries,
+                stats.failures,
+                stats.average_time,
+                stats.max_time,
+            )
+
+
+def get_cloud_transport(hass: HomeAssistant) -> TuyaCloudTransport:
+    """Get the transport shared by all the managers."""
+    transport: TuyaCloudTransport | None = hass.data.get(DATA_CLOUD_TRANSPORT)
+    if transport is None:
+        transport = TuyaCloudTransport(hass)
+        hass.data[DATA_CLOUD_TRANSPORT] = transport
+    return transport
 
 
 class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
     """Cloud connected manager of the Tuya BLE devices credentials."""
 
-    def __init__(self, hass: HomeAssistant, data: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        data: dict[str, Any],
+        entry: ConfigEntry | None = None,
+    ) -> None:
         assert hass is not None
         self._hass = hass
         self._data = data
+        self._entry = entry
+        self._transport = get_cloud_transport(hass)
 
     @staticmethod
     def _is_login_success(response: dict[Any, Any]) -> bool:
@@ -135,7 +330,8 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
         if len(data) == 0:
             return {}
 
-        api = TuyaOpenAPI(
+        api = TuyaPooledOpenAPI(
+            self._transport.session,
             endpoint=data.get(CONF_ENDPOINT, ""),
             access_id=data.get(CONF_ACCESS_ID, ""),
             access_secret=data.get(CONF_ACCESS_SECRET, ""),
@@ -143,7 +339,8 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
         )
         api.set_dev_channel("hass")
 
-        response = await self._hass.async_add_executor_job(
+        response = await self._transport.async_call(
+            self._transport.get_account_key(data),
             api.connect,
             data.get(CONF_USERNAME, ""),
             data.get(CONF_PASSWORD, ""),
@@ -174,65 +371,167 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
     async def login(self, add_to_cache: bool = False) -> dict[Any, Any]:
         return await self._login(self._data, add_to_cache)
 
+    @staticmethod
+    def _get_device_credentials(device: dict[str, Any], mac: str) -> dict[str, Any]:
+        return {
+            CONF_ADDRESS: mac,
+            CONF_UUID: device.get("uuid"),
+            CONF_LOCAL_KEY: device.get("local_key"),
+            CONF_DEVICE_ID: device.get("id"),
+            CONF_CATEGORY: device.get("category"),
+            CONF_PRODUCT_ID: device.get("product_id"),
+            CONF_DEVICE_NAME: device.get("name"),
+            CONF_PRODUCT_MODEL: device.get("model"),
+            CONF_PRODUCT_NAME: device.get("product_name"),
+        }
+
+    async def _fetch_device_mac(
+        self, account: str, item: TuyaCloudCacheItem, device_id: str
+    ) -> tuple[bool, str | None]:
+        """Returns if factory info was received and MAC of BLE device."""
+        try:
+            fi_response = await self._transport.async_get(
+                account,
+                item.api,
+                TUYA_API_FACTORY_INFO_URL % (device_id),
+            )
+        except (requests.RequestException, ValueError):
+            return (False, None)
+        if not fi_response or not fi_response.get(TUYA_RESPONSE_SUCCESS):
+            return (False, None)
+        fi_response_result = fi_response.get(TUYA_RESPONSE_RESULT)
+        if fi_response_result and len(fi_response_result) > 0:
+            factory_info = fi_response_result[0]
+            if factory_info and (TUYA_FACTORY_INFO_MAC in factory_info):
+                return (
+                    True,
+                    ":".join(
+                        factory_info[TUYA_FACTORY_INFO_MAC][i : i + 2]
+                        for i in range(0, 12, 2)
+                    ).upper(),
+                )
+        return (True, None)
+
     async def _fill_cache_item(self, item: TuyaCloudCacheItem) -> None:
-        devices_response = await self._hass.async_add_executor_job(
-            item.api.get,
+        """Refresh credentials of the cache item.
+
+        Factory info is requested only for devices which are new or whose
+        local key was changed since the previous refresh.
+        """
+        account = self._transport.get_account_key(item.login)
+        devices_response = await self._transport.async_get(
+            account,
+            item.api,
             TUYA_API_DEVICES_URL % (item.api.token_info.uid),
         )
-        if devices_response.get(TUYA_RESPONSE_SUCCESS):
-            devices = devices_response.get(TUYA_RESPONSE_RESULT)
-            if isinstance(devices, Iterable):
-                for device in devices:
-                    fi_response = await self._hass.async_add_executor_job(
-                        item.api.get,
-                        TUYA_API_FACTORY_INFO_URL % (device.get("id")),
-                    )
-                    fi_response_result = fi_response.get(TUYA_RESPONSE_RESULT)
-                    if fi_response_result and len(fi_response_result) > 0:
-                        factory_info = fi_response_result[0]
-                        if factory_info and (TUYA_FACTORY_INFO_MAC in factory_info):
-                            mac = ":".join(
-                                factory_info[TUYA_FACTORY_INFO_MAC][i : i + 2]
-                                for i in range(0, 12, 2)
-                            ).upper()
-                            item.credentials[mac] = {
-                                CONF_ADDRESS: mac,
-                                CONF_UUID: device.get("uuid"),
-                                CONF_LOCAL_KEY: device.get("local_key"),
-                                CONF_DEVICE_ID: device.get("id"),
-                                CONF_CATEGORY: device.get("category"),
-                                CONF_PRODUCT_ID: device.get("product_id"),
-                                CONF_DEVICE_NAME: device.get("name"),
-                                CONF_PRODUCT_MODEL: device.get("model"),
-                                CONF_PRODUCT_NAME: device.get("product_name"),
-                            }
+        if not devices_response.get(TUYA_RESPONSE_SUCCESS):
+            return
+        devices = devices_response.get(TUYA_RESPONSE_RESULT)
+        if not isinstance(devices, Iterable):
+            return
+
+        seen_ids: set[str] = set()
+        fetched = 0
+        failed = 0
+        for device in devices:
+            device_id = device.get("id")
+            local_key = device.get("local_key")
+            seen_ids.add(device_id)
+            mac: str | None
+            if (
+                device_id in item.device_keys
+                and item.device_keys[device_id] == local_key
+            ):
+                mac = item.device_macs.get(device_id)
+            else:
+                fetched += 1
+                received, mac = await self._fetch_device_mac(
+                    account, item, device_id
+                )
+                if not received:
+                    # Keep the last known MAC, retry on the next refresh.
+                    failed += 1
+                    mac = item.device_macs.get(device_id)
+                    if mac:
+                        item.credentials[mac] = self._get_device_credentials(
+                            device, mac
+                        )
+                    continue
+                old_mac = item.device_macs.pop(device_id, None)
+                if old_mac and old_mac != mac:
+                    item.credentials.pop(old_mac, None)
+                if mac:
+                    item.device_macs[device_id] = mac
+                item.device_keys[device_id] = local_key
+            if mac:
+                item.credentials[mac] = self._get_device_credentials(device, mac)
+
+        for device_id in set(item.device_keys) | set(item.device_macs):
+            if device_id not in seen_ids:
+                item.device_keys.pop(device_id, None)
+                mac = item.device_macs.pop(device_id, None)
+                if mac:
+                    item.credentials.pop(mac, None)
+
+        _LOGGER.debug(
+            "Cloud cache refreshed for %s: %s devices, "
+            "%s factory info requests, %s failed",
+            item.login.get(CONF_USERNAME),
+            len(seen_ids),
+            fetched,
+            failed,
+        )
+        self._transport.log_stats()
 
-    async def build_cache(self) -> None:
+    async def _build_cache_item(self, data: dict[str, Any]) -> None:
         global _cache
-        data = {}
+        key = self._get_cache_key(data)
+        item = _cache.get(key)
+        if item is None or len(item.credentials) == 0:
+            if self._is_login_success(await self._login(data, True)):
+                item = _cache.get(key)
+                if item and len(item.credentials) == 0:
+                    await self._fill_cache_item(item)
+
+    async def build_cache(self) -> None:
         tuya_config_entries = self._hass.config_entries.async_entries(TUYA_DOMAIN)
         for config_entry in tuya_config_entries:
-            data.clear()
-            data.update(config_entry.data)
-            key = self._get_cache_key(data)
-            item = _cache.get(key)
-            if item is None or len(item.credentials) == 0:
-                if self._is_login_success(await self._login(data, True)):
-                    item = _cache.get(key)
-                    if item and len(item.credentials) == 0:
-                        await self._fill_cache_item(item)
+            await self._build_cache_item(dict(config_entry.data))
 
         ble_config_entries = self._hass.config_entries.async_entries(DOMAIN)
         for config_entry in ble_config_entries:
-            data.clear()
-            data.update(config_entry.options)
-            key = self._get_cache_key(data)
-            item = _cache.get(key)
-            if item is None or len(item.credentials) == 0:
-                if self._is_login_success(await self._login(data, True)):
-                    item = _cache.get(key)
-                    if item and len(item.credentials) == 0:
-                        await self._fill_cache_item(item)
+            await self._build_cache_item(dict(config_entry.options))
+
+    async def fill_cache(self) -> None:
+        """Login once and cache credentials of all devices of the account."""
+        await self._build_cache_item(self._data)
+
+    async def prefetch_device_credentials(self, address: str) -> bool:
+        """Resolve credentials of the discovered device into the cache.
+
+        Cached accounts are refreshed if the device is unknown, i.e. it was
+        added to the account after the cache was built, but not more often
+        than once per PREFETCH_REFRESH_INTERVAL.
+        """
+        global _cache, _last_prefetch_refresh
+        await self.build_cache()
+        for item in _cache.values():
+            if address in item.credentials:
+                return True
+
+        now = time.monotonic()
+        if (
+            _last_prefetch_refresh is not None
+            and now - _last_prefetch_refresh < PREFETCH_REFRESH_INTERVAL
+        ):
+            return False
+        _last_prefetch_refresh = now
+        for item in list(_cache.values()):
+            if item.api:
+                await self._fill_cache_item(item)
+                if address in item.credentials:
+                    return True
+        return False
 
     def get_login_from_cache(self) -> None:
         global _cache
@@ -275,16 +574,7 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
                 credentials = item.credentials.get(address)
 
         if credentials:
-            result = TuyaBLEDeviceCredentials(
-                credentials.get(CONF_UUID, ""),
-                credentials.get(CONF_LOCAL_KEY, ""),
-                credentials.get(CONF_DEVICE_ID, ""),
-                credentials.get(CONF_CATEGORY, ""),
-                credentials.get(CONF_PRODUCT_ID, ""),
-                credentials.get(CONF_DEVICE_NAME, ""),
-                credentials.get(CONF_PRODUCT_MODEL, ""),
-                credentials.get(CONF_PRODUCT_NAME, ""),
-            )
+            result = self._make_device_credentials(credentials)
             _LOGGER.debug("Retrieved: %s", result)
             if save_data:
                 if item:
@@ -293,6 +583,65 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
 
         return result
 
+    async def refresh_device_credentials(
+        self,
+        address: str,
+    ) -> TuyaBLEDeviceCredentials | None:
+        """Refresh credentials of the single Tuya BLE device."""
+        global _cache
+        item: TuyaCloudCacheItem | None = None
+        credentials: dict[str, Any] | None = None
+        device_id = self._data.get(CONF_DEVICE_ID)
+
+        if device_id and self._has_login(self._data):
+            cache_key = self._get_cache_key(self._data)
+            item = _cache.get(cache_key)
+            if item is None or item.api is None:
+                if self._is_login_success(await self.login(True)):
+                    item = _cache.get(cache_key)
+
+        if item and item.api:
+            response = await self._transport.async_get(
+                self._transport.get_account_key(item.login),
+                item.api,
+                TUYA_API_DEVICE_URL % (device_id),
+            )
+            device = response.get(TUYA_RESPONSE_RESULT)
+            if response.get(TUYA_RESPONSE_SUCCESS) and isinstance(device, dict):
+                credentials = self._get_device_credentials(device, address)
+                item.credentials[address] = credentials
+                item.device_keys[device_id] = credentials[CONF_LOCAL_KEY]
+                item.device_macs[device_id] = address
+
+        result: TuyaBLEDeviceCredentials | None = None
+        if credentials:
+            result = self._make_device_credentials(credentials)
+            self._data.update(credentials)
+        else:
+            result = await self.get_device_credentials(address, True, True)
+
+        if result and self._entry:
+            self._hass.config_entries.async_update_entry(
+                self._entry, options=self._data.copy()
+            )
+
+        return result
+
+    @staticmethod
+    def _make_device_credentials(
+        credentials: dict[str, Any]
+    ) -> TuyaBLEDeviceCredentials:
+        return TuyaBLEDeviceCredentials(
+            credentials.get(CONF_UUID, ""),
+            credentials.get(CONF_LOCAL_KEY, ""),
+            credentials.get(CONF_DEVICE_ID, ""),
+            credentials.get(CONF_CATEGORY, ""),
+            credentials.get(CONF_PRODUCT_ID, ""),
+            credentials.get(CONF_DEVICE_NAME, ""),
+            credentials.get(CONF_PRODUCT_MODEL, ""),
+            credentials.get(CONF_PRODUCT_NAME, ""),
+        )
+
     @property
     def data(self) -> dict[str, Any]:
         return self._data
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import pycountry
 from typing import Any
@@ -10,6 +11,7 @@ import voluptuous as vol
 from tuya_iot import AuthType
 
 from homeassistant.config_entries import (
+    SOURCE_IMPORT,
     ConfigEntry,
     ConfigFlow,
     OptionsFlowWithConfigEntry,
@@ -34,22 +36,34 @@ from homeassistant.components.tuya.const import (
     TUYA_RESPONSE_MSG,
     TUYA_RESPONSE_SUCCESS,
 )
-from .tuya_ble import SERVICE_UUID, TuyaBLEDeviceCredentials
+from .tuya_ble import (
+    SERVICE_UUID,
+    AbstaractTuyaBLEDeviceManager,
+    TuyaBLEDeviceCredentials,
+)
 
 from .const import (
     DOMAIN,
     CONF_ACCESS_ID,
     CONF_ACCESS_SECRET,
     CONF_AUTH_TYPE,
+    CONF_CREDENTIALS_PATH,
+    CONF_OPTIMISTIC,
+    CONF_PREFETCH_CREDENTIALS,
+    CONF_STARTUP_RAMP,
     SMARTLIFE_APP,
+    STARTUP_RAMP,
     TUYA_SMART_APP,
     TUYA_COUNTRIES
 )
 from .devices import TuyaBLEData, get_device_readable_name
-from .cloud import HASSTuyaBLEDeviceManager
+from .cloud import CONF_TUYA_LOGIN_KEYS, HASSTuyaBLEDeviceManager
+from .offline import async_validate_offline_path, get_offline_manager
 
 _LOGGER = logging.getLogger(__name__)
 
+ALL_DEVICES = "all"
+
 
 async def _try_login(
     manager: HASSTuyaBLEDeviceManager,
@@ -100,11 +114,65 @@ async def _try_login(
     return None
 
 
+def _options_schema(
+    user_input: dict[str, Any], show_prefetch: bool
+) -> dict[Any, Any]:
+    """Schema of the device options shown with the credentials source."""
+    options: dict[Any, Any] = {}
+    if show_prefetch:
+        options[
+            vol.Optional(
+                CONF_PREFETCH_CREDENTIALS,
+                default=user_input.get(CONF_PREFETCH_CREDENTIALS, False),
+            )
+        ] = bool
+    options[
+        vol.Optional(
+            CONF_STARTUP_RAMP,
+            default=user_input.get(CONF_STARTUP_RAMP, STARTUP_RAMP),
+        )
+    ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=600))
+    options[
+        vol.Optional(
+            CONF_OPTIMISTIC,
+            default=user_input.get(CONF_OPTIMISTIC, False),
+        )
+    ] = bool
+    return options
+
+
+def _show_offline_form(
+    flow: FlowHandler,
+    user_input: dict[str, Any],
+    errors: dict[str, str],
+    show_options: bool = False,
+) -> FlowResult:
+    """Shows the form of the offline credentials file."""
+    options: dict[Any, Any] = {}
+    if show_options:
+        options = _options_schema(user_input, False)
+
+    return flow.async_show_form(
+        step_id="offline",
+        data_schema=vol.Schema(
+            {
+                vol.Required(
+                    CONF_CREDENTIALS_PATH,
+                    default=user_input.get(CONF_CREDENTIALS_PATH, ""),
+                ): str,
+                **options,
+            }
+        ),
+        errors=errors,
+    )
+
+
 def _show_login_form(
     flow: FlowHandler,
     user_input: dict[str, Any],
     errors: dict[str, str],
     placeholders: dict[str, Any],
+    show_options: bool = False,
 ) -> FlowResult:
     """Shows the Tuya IOT platform login form."""
     if user_input is not None and user_input.get(CONF_COUNTRY_CODE) is not None:
@@ -121,6 +189,10 @@ def _show_login_form(
     except:
         pass
 
+    options: dict[Any, Any] = {}
+    if show_options:
+        options = _options_schema(user_input, True)
+
     return flow.async_show_form(
         step_id="login",
         data_schema=vol.Schema(
@@ -145,6 +217,7 @@ def _show_login_form(
                 vol.Required(
                     CONF_PASSWORD, default=user_input.get(CONF_PASSWORD, "")
                 ): str,
+                **options,
             }
         ),
         errors=errors,
@@ -163,8 +236,42 @@ class TuyaBLEOptionsFlow(OptionsFlowWithConfigEntry):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        if self.config_entry.options.get(CONF_CREDENTIALS_PATH):
+            return await self.async_step_offline(user_input)
         return await self.async_step_login(user_input)
 
+    async def async_step_offline(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the offline credentials file step."""
+        errors: dict[str, str] = {}
+        address: str | None = self.config_entry.data.get(CONF_ADDRESS)
+
+        if user_input is not None:
+            path = user_input[CONF_CREDENTIALS_PATH]
+            if not await async_validate_offline_path(self.hass, path):
+                errors["base"] = "invalid_credentials_path"
+            elif not await get_offline_manager(
+                self.hass, path
+            ).get_device_credentials(address, True):
+                errors["base"] = "device_not_in_credentials"
+            else:
+                return self.async_create_entry(
+                    title=self.config_entry.title,
+                    data={
+                        CONF_CREDENTIALS_PATH: path,
+                        CONF_STARTUP_RAMP: user_input.get(
+                            CONF_STARTUP_RAMP, STARTUP_RAMP
+                        ),
+                        CONF_OPTIMISTIC: user_input.get(CONF_OPTIMISTIC, False),
+                    },
+                )
+
+        if user_input is None:
+            user_input = dict(self.config_entry.options)
+
+        return _show_offline_form(self, user_input, errors, True)
+
     async def async_step_login(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -191,6 +298,15 @@ class TuyaBLEOptionsFlow(OptionsFlowWithConfigEntry):
                         address, True, True
                     )
                     if credentials:
+                        entry.manager.data[CONF_PREFETCH_CREDENTIALS] = user_input.get(
+                            CONF_PREFETCH_CREDENTIALS, False
+                        )
+                        entry.manager.data[CONF_STARTUP_RAMP] = user_input.get(
+                            CONF_STARTUP_RAMP, STARTUP_RAMP
+                        )
+                        entry.manager.data[CONF_OPTIMISTIC] = user_input.get(
+                            CONF_OPTIMISTIC, False
+                        )
                         return self.async_create_entry(
                             title=self.config_entry.title,
                             data=entry.manager.data,
@@ -202,7 +318,7 @@ class TuyaBLEOptionsFlow(OptionsFlowWithConfigEntry):
             user_input = {}
             user_input.update(self.config_entry.options)
 
-        return _show_login_form(self, user_input, errors, placeholders)
+        return _show_login_form(self, user_input, errors, placeholders, True)
 
 
 class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -216,7 +332,7 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
         self._data: dict[str, Any] = {}
-        self._manager: HASSTuyaBLEDeviceManager | None = None
+        self._manager: AbstaractTuyaBLEDeviceManager | None = None
         self._get_device_info_error = False
 
     async def async_step_bluetooth(
@@ -235,16 +351,31 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
                 self._manager,
             )
         }
-        return await self.async_step_login()
+        return await self.async_step_user()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the user step."""
-        if self._manager is None:
-            self._manager = HASSTuyaBLEDeviceManager(self.hass, self._data)
-        await self._manager.build_cache()
-        return await self.async_step_login()
+        """Handle the user step to pick the source of credentials."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["login", "offline"]
+        )
+
+    async def async_step_offline(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the offline credentials file step."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            path = user_input[CONF_CREDENTIALS_PATH]
+            if await async_validate_offline_path(self.hass, path):
+                self._manager = get_offline_manager(self.hass, path)
+                self._data = {CONF_CREDENTIALS_PATH: path}
+                return await self.async_step_device()
+            errors["base"] = "invalid_credentials_path"
+
+        return _show_offline_form(self, user_input or {}, errors)
 
     async def async_step_login(
         self, user_input: dict[str, Any] | None = None
@@ -254,6 +385,11 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         placeholders: dict[str, Any] = {}
 
+        if not isinstance(self._manager, HASSTuyaBLEDeviceManager):
+            self._data = {}
+            self._manager = HASSTuyaBLEDeviceManager(self.hass, self._data)
+            await self._manager.build_cache()
+
         if user_input is not None:
             data = await _try_login(
                 self._manager,
@@ -286,6 +422,9 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle the user step to pick discovered device."""
         errors: dict[str, str] = {}
 
+        if user_input is not None and user_input[CONF_ADDRESS] == ALL_DEVICES:
+            return await self.async_step_bulk()
+
         if user_input is not None:
             address = user_input[CONF_ADDRESS]
             discovery_info = self._discovered_devices[address]
@@ -300,7 +439,11 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
             self._data[CONF_ADDRESS] = discovery_info.address
             if credentials is None:
                 self._get_device_info_error = True
-                errors["base"] = "device_not_registered"
+                errors["base"] = (
+                    "device_not_in_credentials"
+                    if CONF_CREDENTIALS_PATH in self._data
+                    else "device_not_registered"
+                )
             else:
                 return self.async_create_entry(
                     title=local_name,
@@ -331,6 +474,16 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         else:
             def_address = list(self._discovered_devices)[0]
 
+        devices: dict[str, str] = {
+            service_info.address: await get_device_readable_name(
+                service_info,
+                self._manager,
+            )
+            for service_info in self._discovered_devices.values()
+        }
+        if self._discovery_info is None and len(devices) > 1:
+            devices[ALL_DEVICES] = "All discovered devices (%s)" % (len(devices))
+
         return self.async_show_form(
             step_id="device",
             data_schema=vol.Schema(
@@ -338,20 +491,121 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
                     vol.Required(
                         CONF_ADDRESS,
                         default=def_address,
-                    ): vol.In(
-                        {
-                            service_info.address: await get_device_readable_name(
-                                service_info,
-                                self._manager,
-                            )
-                            for service_info in self._discovered_devices.values()
-                        }
-                    ),
+                    ): vol.In(devices),
                 },
             ),
             errors=errors,
         )
 
+    async def _async_resolve_device(
+        self,
+        login: dict[str, Any],
+        discovery_info: BluetoothServiceInfoBleak,
+        force_update: bool,
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Resolve credentials and readable name of the discovered device."""
+        manager: AbstaractTuyaBLEDeviceManager
+        options: dict[str, Any]
+        if CONF_CREDENTIALS_PATH in login:
+            manager = self._manager
+            options = login.copy()
+        else:
+            cloud_manager = HASSTuyaBLEDeviceManager(self.hass, login.copy())
+            manager = cloud_manager
+            options = cloud_manager.data
+        credentials = await manager.get_device_credentials(
+            discovery_info.address, force_update, True
+        )
+        if credentials is None:
+            return None
+        title = await get_device_readable_name(discovery_info, manager)
+        options[CONF_ADDRESS] = discovery_info.address
+        return (title, options)
+
+    async def async_step_bulk(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add all discovered devices at once."""
+        if CONF_CREDENTIALS_PATH in self._data:
+            login = self._data.copy()
+        else:
+            login = {key: self._data.get(key) for key in CONF_TUYA_LOGIN_KEYS}
+        current_addresses = self._async_current_ids()
+        discovered = [
+            discovery_info
+            for address, discovery_info in self._discovered_devices.items()
+            if address not in current_addresses
+        ]
+
+        if CONF_CREDENTIALS_PATH not in login:
+            # Resolves run concurrently, with a cold cache each of them would
+            # login and fetch the whole device list on its own.
+            await HASSTuyaBLEDeviceManager(self.hass, login.copy()).fill_cache()
+
+        results = await asyncio.gather(
+            *(
+                self._async_resolve_device(login, discovery_info, False)
+                for discovery_info in discovered
+            )
+        )
+        if None in results:
+            # Some devices could be added to the account after the cache
+            # was built, refresh it once and try unresolved devices again.
+            unresolved = [
+                discovery_info
+                for discovery_info, result in zip(discovered, results)
+                if result is None
+            ]
+            await self._async_resolve_device(login, unresolved[0], True)
+            retried = iter(
+                await asyncio.gather(
+                    *(
+                        self._async_resolve_device(login, discovery_info, False)
+                        for discovery_info in unresolved
+                    )
+                )
+            )
+            results = [
+                result if result is not None else next(retried)
+                for result in results
+            ]
+
+        added: list[str] = []
+        failed: list[str] = []
+        for discovery_info, result in zip(discovered, results):
+            if result is None:
+                failed.append(discovery_info.address)
+                continue
+            title, options = result
+            added.append(title)
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_IMPORT},
+                    data={"title": title, "options": options},
+                )
+            )
+
+        return self.async_abort(
+            reason="bulk_added",
+            description_placeholders={
+                "added": ", ".join(added) if added else "-",
+                "failed": ", ".join(failed) if failed else "-",
+            },
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create entry for the device resolved by the bulk step."""
+        options: dict[str, Any] = import_data["options"]
+        address = options[CONF_ADDRESS]
+        await self.async_set_unique_id(address)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=import_data["title"],
+            data={CONF_ADDRESS: address},
+            options=options,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
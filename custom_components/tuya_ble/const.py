@@ -12,6 +12,29 @@ DEVICE_METADATA_UUIDS: Final = "uuids"
 
 DEVICE_DEF_MANUFACTURER: Final = "Tuya"
 SET_DISCONNECTED_DELAY = 10 * 60
+THROTTLE_FLUSH_DELAY = 60
+OPTIMISTIC_TIMEOUT = 5
+PREFETCH_REFRESH_INTERVAL = 10 * 60
+STARTUP_RAMP = 30
+# Time for the last devices of the ramp to connect before startup is over
+STARTUP_GRACE = 30
+
+NO_RSSI_VALUE: Final = -127
+
+# Credentials files with these extensions are SQLite databases
+SQLITE_EXTENSIONS: Final = (".db", ".sqlite", ".sqlite3")
+
+DATAPOINTS_SAVE_DELAY = 30
+DATAPOINTS_STORAGE_KEY: Final = "tuya_ble.datapoints"
+DATAPOINTS_STORAGE_VERSION: Final = 1
+# Locks, fingerbots and covers are connected first at startup
+STARTUP_PRIORITY_CATEGORIES: Final = ("ms", "szjqr", "cl")
+
+DATA_PREFETCHER: Final = "tuya_ble_prefetcher"
+DATA_STARTUP_PLANNER: Final = "tuya_ble_startup_planner"
+DATA_DATAPOINTS_STORE: Final = "tuya_ble_datapoints_store"
+DATA_CLOUD_TRANSPORT: Final = "tuya_ble_cloud_transport"
+DATA_OFFLINE_MANAGERS: Final = "tuya_ble_offline_managers"
 
 CONF_UUID: Final = "uuid"
 CONF_LOCAL_KEY: Final = "local_key"
@@ -20,6 +43,10 @@ CONF_PRODUCT_ID: Final = "product_id"
 CONF_DEVICE_NAME: Final = "device_name"
 CONF_PRODUCT_MODEL: Final = "product_model"
 CONF_PRODUCT_NAME: Final = "product_name"
+CONF_PREFETCH_CREDENTIALS: Final = "prefetch_credentials"
+CONF_STARTUP_RAMP: Final = "startup_ramp"
+CONF_OPTIMISTIC: Final = "optimistic"
+CONF_CREDENTIALS_PATH: Final = "credentials_path"
 
 CONF_AUTH_TYPE = "auth_type"
 CONF_PROJECT_TYPE = "tuya_project_type"
@@ -30,9 +57,18 @@ SMARTLIFE_APP = "smartlife"
 TUYA_SMART_APP = "tuyaSmart"
 
 TUYA_API_DEVICES_URL: Final = "/v1.0/users/%s/devices"
+TUYA_API_DEVICE_URL: Final = "/v1.0/devices/%s"
 TUYA_API_FACTORY_INFO_URL: Final = "/v1.0/iot-03/devices/factory-infos?device_ids=%s"
 TUYA_FACTORY_INFO_MAC: Final = "mac"
 
+TUYA_API_RATE: Final = 5.0  # calls per second for a single account
+TUYA_API_BURST: Final = 10
+TUYA_API_RETRIES: Final = 3
+TUYA_API_RETRY_DELAY: Final = 1.0
+TUYA_API_POOL_SIZE: Final = 10
+# 500 - system error, 1110 - concurrent request over limit
+TUYA_API_RETRY_CODES: Final = (500, 1110)
+
 BATTERY_STATE_LOW: Final = "low"
 BATTERY_STATE_NORMAL: Final = "normal"
 BATTERY_STATE_HIGH: Final = "high"
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 from dataclasses import dataclass
 
-from datetime import datetime, timezone
 from enum import IntEnum
 import logging
 
@@ -18,12 +16,15 @@ from homeassistant.components.cover import (
     ATTR_POSITION,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -116,18 +117,10 @@ mapping: dict[str, TuyaBLECategoryCoverMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLECategoryCoverMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLECategoryCoverMapping, ...]:
+    return get_device_mappings(device, Platform.COVER)
 
 
 class TuyaBLECover(TuyaBLEEntity, CoverEntity):
@@ -194,7 +187,7 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                 if self._attr_current_cover_position == 100:
                     self._attr_is_opening = False
 
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_open_cover(self, **kwargs) -> None:
         """Open a cover."""
@@ -210,20 +203,32 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
 
     async def _update_cover_state(self, state: TuyaCoverState) -> None:
         if self._mapping.cover_state_dp_id != 0:
-            # In some circumstances (presumably due to a communication error in between where packets were lost)
-            # It can be the case that the device does not update the state of the cover and does not accept new commands.
-            # This is why a timer is here to verify that the state is updated and to manually request the status update
-            # if no new data has come in within 1 second as it points to a communication error (as happened in tests with
-            # the kcy0x4pi product).
-            self._hass.add_job(
-                self._validate_data_update_from_device_and_reconnect_if_needed(
-                    time_now=datetime.now(timezone.utc)
-                )
+            # In some circumstances (presumably due to a communication error in
+            # between where packets were lost) the device does not update the
+            # state of the cover and does not accept new commands (as happened
+            # in tests with the kcy0x4pi product). The device requests status
+            # update itself when the written state is not echoed in time.
+            # Moving state is shown at once, sending waits for the device.
+            previous = (
+                self._attr_is_closed,
+                self._attr_is_closing,
+                self._attr_is_opening,
             )
-            self._update_cover_state_without_validation(state)
             self._update_ha_state_for_cover_state(state)
-
-    def _update_cover_state_without_validation(self, state: TuyaCoverState) -> None:
+            try:
+                await self._update_cover_state_without_validation(state)
+            except HomeAssistantError:
+                (
+                    self._attr_is_closed,
+                    self._attr_is_closing,
+                    self._attr_is_opening,
+                ) = previous
+                self.async_write_ha_state()
+                raise
+
+    async def _update_cover_state_without_validation(
+        self, state: TuyaCoverState
+    ) -> None:
         if self._mapping.cover_state_dp_id != 0:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.cover_state_dp_id,
@@ -231,25 +236,7 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                 state.value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(state.value))
-
-    async def _validate_data_update_from_device_and_reconnect_if_needed(
-        self,
-        sleep_ms: int = 1000,
-        time_now: datetime | None = None,
-    ) -> None:
-        time_now = time_now or datetime.now(timezone.utc)
-        await asyncio.sleep(sleep_ms / 1000.0)
-        if self._device._is_paired and (
-            not self._device.last_data_received
-            or self._device.last_data_received < time_now
-        ):
-            _LOGGER.warning(
-                "No data received from device (cover) %s within %dms, manually requesting status update",
-                self._device.name,
-                sleep_ms,
-            )
-            await self._device.update()
+                await self._async_set_datapoint(datapoint, state.value)
 
     def _update_ha_state_for_cover_state(self, state: TuyaCoverState) -> None:
         # sometimes the device does not update DP 1 so force the current state
@@ -276,7 +263,7 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                 position,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(position))
+                await self._async_set_datapoint(datapoint, position)
 
 
 async def async_setup_entry(
@@ -1,11 +1,15 @@
 """The Tuya BLE integration."""
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from functools import partial
 import logging
-from homeassistant.const import CONF_ADDRESS, CONF_DEVICE_ID
+import time
+from typing import Any, Awaitable, Callable
+from homeassistant.const import CONF_ADDRESS, CONF_DEVICE_ID, Platform
 
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import (
     DeviceInfo,
@@ -18,20 +22,27 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
+from bleak_retry_connector import BLEAK_RETRY_EXCEPTIONS
 from home_assistant_bluetooth import BluetoothServiceInfoBleak
 from .tuya_ble import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDataPoint,
     TuyaBLEDevice,
     TuyaBLEDeviceCredentials,
+    TuyaBLEError,
+    TuyaBLERawField,
+    TuyaBLERawRecords,
+    TuyaBLERawSchema,
 )
 
-from .cloud import HASSTuyaBLEDeviceManager
+from .registry import get_product_entry
 from .const import (
     DEVICE_DEF_MANUFACTURER,
     DOMAIN,
     FINGERBOT_BUTTON_EVENT,
+    OPTIMISTIC_TIMEOUT,
     SET_DISCONNECTED_DELAY,
+    THROTTLE_FLUSH_DELAY,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,6 +60,37 @@ class TuyaBLEFingerbotInfo:
     program: int = 0
 
 
+# Program of the fingerbot: repeat count (0xFFFF to repeat forever), idle
+# position and steps of position with delay in ms.
+FINGERBOT_PROGRAM_SCHEMA = TuyaBLERawSchema(
+    "fingerbot_program",
+    (
+        TuyaBLERawField("repeat_count", "H"),
+        TuyaBLERawField("idle_position", "B"),
+        TuyaBLERawField("step_count", "B"),
+    ),
+    TuyaBLERawRecords(
+        "steps",
+        "step_count",
+        (
+            TuyaBLERawField("position", "B"),
+            TuyaBLERawField("delay", "H"),
+        ),
+    ),
+)
+
+
+def decode_fingerbot_program(datapoint: TuyaBLEDataPoint | None) -> Any | None:
+    """Decoded program of the fingerbot, None if missing or malformed."""
+    if datapoint is None or type(datapoint.value) is not bytes:
+        return None
+    try:
+        return FINGERBOT_PROGRAM_SCHEMA.decode(datapoint.value)
+    except TuyaBLEError:
+        _LOGGER.debug("Malformed fingerbot program: %s", datapoint.value.hex())
+        return None
+
+
 @dataclass
 class TuyaBLEProductInfo:
     name: str
@@ -56,6 +98,13 @@ class TuyaBLEProductInfo:
     fingerbot: TuyaBLEFingerbotInfo | None = None
 
 
+@dataclass
+class _TuyaBLEOptimisticWrite:
+    datapoint: TuyaBLEDataPoint
+    previous: Any
+    unsub_timeout: CALLBACK_TYPE
+
+
 class TuyaBLEEntity(CoordinatorEntity):
     """Tuya BLE base entity."""
 
@@ -81,16 +130,246 @@ class TuyaBLEEntity(CoordinatorEntity):
         self.entity_id = generate_entity_id(
             "sensor.{}", self._attr_unique_id, hass=hass
         )
+        self._state_fingerprint: tuple[Any, ...] | None = None
+        self._optimistic_writes: dict[int, _TuyaBLEOptimisticWrite] = {}
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self._coordinator.connected
+        return self._coordinator.connected or self._coordinator.restored
+
+    @property
+    def assumed_state(self) -> bool:
+        """Restored values and commanded values not yet confirmed are assumed."""
+        return self._coordinator.restored or len(self._optimistic_writes) > 0
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._coordinator.optimistic:
+            self.async_on_remove(
+                self._coordinator.async_add_listener(self._async_reconcile_optimistic)
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        for write in self._optimistic_writes.values():
+            write.unsub_timeout()
+        self._optimistic_writes.clear()
+
+    def _get_state_fingerprint(self) -> tuple[Any, ...]:
+        return (
+            self.available,
+            self.assumed_state,
+            self.state,
+            self.icon,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._state_fingerprint = None
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state only if the computed state changed since last write."""
+        fingerprint = self._get_state_fingerprint()
+        if fingerprint == self._state_fingerprint:
+            self._coordinator.suppressed_state_writes += 1
+            return
+        self.async_write_ha_state()
+        self._state_fingerprint = fingerprint
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
+
+    async def _async_set_datapoint(
+        self,
+        datapoint: TuyaBLEDataPoint,
+        value: bytes | bool | int | str,
+        track_echo: bool = True,
+    ) -> None:
+        """Send new value of the datapoint, errors are raised to the caller.
+
+        In optimistic mode the value is shown at once and kept pending until
+        the device reports the datapoint, it is rolled back on failure or
+        when the device does not report it in time. Write-only datapoints
+        are sent with track_echo False, no report is awaited for them.
+        """
+        await self._async_write_datapoint(
+            datapoint,
+            partial(datapoint.set_value, value, track_echo=track_echo),
+            track_echo,
+        )
+
+    async def _async_edit_datapoint(
+        self, datapoint: TuyaBLEDataPoint, edit: Callable[[bytes], bytes]
+    ) -> None:
+        """Send partial edit of the raw or bitmap datapoint.
+
+        Concurrent edits of the datapoint are merged into a single write.
+        """
+        await self._async_write_datapoint(
+            datapoint, partial(datapoint.update_value, edit)
+        )
+
+    async def _async_write_datapoint(
+        self,
+        datapoint: TuyaBLEDataPoint,
+        write: Callable[[Callable[[], None] | None], Awaitable[None]],
+        track_echo: bool = True,
+    ) -> None:
+        on_assigned: Callable[[], None] | None = None
+        if self._coordinator.optimistic and track_echo:
+            on_assigned = partial(
+                self._async_apply_optimistic, datapoint, datapoint.value
+            )
+        try:
+            await write(on_assigned)
+        except (TuyaBLEError, *BLEAK_RETRY_EXCEPTIONS) as ex:
+            if self._async_end_optimistic(datapoint.id, True):
+                self._handle_coordinator_update()
+            raise HomeAssistantError(
+                "%s: Sending datapoint %s failed: %s"
+                % (self._device.address, datapoint.id, ex)
+            ) from ex
+
+    @callback
+    def _async_apply_optimistic(
+        self, datapoint: TuyaBLEDataPoint, previous: Any
+    ) -> None:
+        write = self._optimistic_writes.pop(datapoint.id, None)
+        if write is not None:
+            # Roll back to the last value confirmed by the device.
+            write.unsub_timeout()
+            previous = write.previous
+
+        @callback
+        def _async_timeout(_: Any) -> None:
+            if self._async_end_optimistic(datapoint.id, True):
+                self._handle_coordinator_update()
+
+        self._optimistic_writes[datapoint.id] = _TuyaBLEOptimisticWrite(
+            datapoint,
+            previous,
+            async_call_later(self.hass, OPTIMISTIC_TIMEOUT, _async_timeout),
+        )
+        self._handle_coordinator_update()
+
+    @callback
+    def _async_end_optimistic(self, dp_id: int, rollback: bool) -> bool:
+        """Stop tracking the pending value, returns True if it was pending."""
+        write = self._optimistic_writes.pop(dp_id, None)
+        if write is None:
+            return False
+        write.unsub_timeout()
+        if rollback and write.datapoint.rollback(write.previous):
+            _LOGGER.debug(
+                "%s: Value of datapoint %s not confirmed, rolled back to %s",
+                self._device.address,
+                dp_id,
+                write.previous,
+            )
+        return True
+
+    @callback
+    def _async_reconcile_optimistic(self) -> None:
+        """Drop pending values of the datapoints reported by the device."""
+        reported = [
+            dp_id
+            for dp_id, write in self._optimistic_writes.items()
+            if not write.datapoint.write_pending
+        ]
+        for dp_id in reported:
+            self._async_end_optimistic(dp_id, False)
+        if reported:
+            self.async_write_ha_state_if_changed()
+
+
+class TuyaBLEValueThrottle:
+    """Holds back small or too frequent changes of a measured value.
+
+    A change is published when it exceeds the deadband (absolute or percent
+    of the last published value) and the minimal interval since the last
+    published change has passed. The last held back value is published by
+    a trailing flush, so it is never lost.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        deadband: float,
+        deadband_percent: bool,
+        min_interval: float,
+        publish: Callable[[Any], None],
+    ) -> None:
+        self._hass = hass
+        self._deadband = deadband
+        self._deadband_percent = deadband_percent
+        self._min_interval = min_interval
+        self._publish = publish
+        self._value: Any = None
+        self._published: float = 0
+        self._pending: Any = None
+        self._flush_at: float | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_update(self, value: Any) -> bool:
+        """Returns True if the value is to be published now."""
+        now = time.monotonic()
+        if (
+            self._value is None
+            or value == self._value
+            or isinstance(value, bool)
+            or not isinstance(value, (int, float))
+        ):
+            self._accept(value, now)
+            return True
+
+        elapsed = now - self._published
+        band = self._deadband
+        if self._deadband_percent:
+            band = abs(self._value) * self._deadband / 100
+        in_deadband = self._deadband > 0 and abs(value - self._value) <= band
+        too_soon = elapsed < self._min_interval
+        if not in_deadband and not too_soon:
+            self._accept(value, now)
+            return True
+
+        self._pending = value
+        delay = max(self._min_interval - elapsed, 0)
+        if in_deadband:
+            delay = max(delay, THROTTLE_FLUSH_DELAY)
+        if self._flush_at is None or now + delay < self._flush_at:
+            self.async_cancel()
+            self._flush_at = now + delay
+            self._unsub_flush = async_call_later(self._hass, delay, self._async_flush)
+        return False
+
+    def _accept(self, value: Any, now: float) -> None:
+        self.async_cancel()
+        self._value = value
+        self._published = now
+        self._pending = None
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._flush_at = None
+
+    @callback
+    def _async_flush(self, _: Any) -> None:
+        self._unsub_flush = None
+        self._flush_at = None
+        value = self._pending
+        self._accept(value, time.monotonic())
+        self._publish(value)
 
 
 class TuyaBLECoordinator(DataUpdateCoordinator[None]):
@@ -106,6 +385,12 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
         self._device = device
         self._disconnected: bool = True
         self._unsub_disconnect: CALLBACK_TYPE | None = None
+        self.suppressed_state_writes: int = 0
+        self.optimistic: bool = False
+        self._restored: bool = False
+        self._unsub_restored: CALLBACK_TYPE | None = None
+        # First report after restore is compared with the restored values
+        self._skip_events: bool = False
         device.register_connected_callback(self._async_handle_connect)
         device.register_callback(self._async_handle_update)
         device.register_disconnected_callback(self._async_handle_disconnect)
@@ -114,6 +399,11 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
     def connected(self) -> bool:
         return not self._disconnected
 
+    @property
+    def restored(self) -> bool:
+        """Entities show datapoints restored at startup, not reported yet."""
+        return self._restored
+
     @callback
     def _async_handle_connect(self) -> None:
         if self._unsub_disconnect is not None:
@@ -122,11 +412,38 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
             self._disconnected = False
             self.async_update_listeners()
 
+    @callback
+    def async_set_restored(self) -> None:
+        """Expose restored datapoints until the device reports or the delay ends.
+
+        The device is not reported connected meanwhile.
+        """
+        self._restored = True
+        self._skip_events = True
+        if self._unsub_restored is None:
+            self._unsub_restored = async_call_later(
+                self.hass, SET_DISCONNECTED_DELAY, self._async_end_restored
+            )
+
+    @callback
+    def _async_end_restored(self, _: Any) -> None:
+        self._unsub_restored = None
+        if self._restored:
+            self._restored = False
+            self.async_update_listeners()
+
     @callback
     def _async_handle_update(self, updates: list[TuyaBLEDataPoint]) -> None:
         """Just trigger the callbacks."""
+        if self._unsub_restored is not None:
+            self._unsub_restored()
+            self._unsub_restored = None
+        self._restored = False
         self._async_handle_connect()
         self.async_set_updated_data(None)
+        if self._skip_events:
+            self._skip_events = False
+            return
         info = get_device_product_info(self._device)
         if info and info.fingerbot and info.fingerbot.manual_control != 0:
             for update in updates:
@@ -163,8 +480,9 @@ class TuyaBLEData:
     title: str
     device: TuyaBLEDevice
     product: TuyaBLEProductInfo
-    manager: HASSTuyaBLEDeviceManager
+    manager: AbstaractTuyaBLEDeviceManager
     coordinator: TuyaBLECoordinator
+    platforms: list[Platform] = field(default_factory=list)
 
 
 @dataclass
@@ -330,14 +648,7 @@ devices_database: dict[str, TuyaBLECategoryInfo] = {
 def get_product_info_by_ids(
     category: str, product_id: str
 ) -> TuyaBLEProductInfo | None:
-    category_info = devices_database.get(category)
-    if category_info is not None:
-        product_info = category_info.products.get(product_id)
-        if product_info is not None:
-            return product_info
-        return category_info.info
-    else:
-        return None
+    return get_product_entry(category, product_id).info
 
 
 def get_device_product_info(device: TuyaBLEDevice) -> TuyaBLEProductInfo | None:
@@ -0,0 +1,39 @@
+"""Diagnostics support for the Tuya BLE integration."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .cloud import HASSTuyaBLEDeviceManager, get_cloud_transport
+from .const import DOMAIN
+from .devices import TuyaBLEData
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: TuyaBLEData = hass.data[DOMAIN][entry.entry_id]
+    device = data.device
+    cloud_stats = None
+    if isinstance(data.manager, HASSTuyaBLEDeviceManager):
+        transport = get_cloud_transport(hass)
+        cloud_stats = transport.stats.get(
+            transport.get_account_key(data.manager.data)
+        )
+    return {
+        "device": {
+            "category": device.category,
+            "product_id": device.product_id,
+            "protocol_version": device.protocol_version,
+            "rssi": device.rssi,
+        },
+        "cloud_calls": (
+            dict(asdict(cloud_stats), average_time=cloud_stats.average_time)
+            if cloud_stats is not None
+            else None
+        ),
+    }
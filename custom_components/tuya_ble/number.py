@@ -4,7 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 import logging
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 from homeassistant.components.number import (
     NumberEntityDescription,
@@ -15,6 +15,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONCENTRATION_PARTS_PER_MILLION,
     PERCENTAGE,
+    Platform,
     UnitOfTime,
     UnitOfVolume,
     UnitOfTemperature,
@@ -25,7 +26,14 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    FINGERBOT_PROGRAM_SCHEMA,
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    decode_fingerbot_program,
+)
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,7 +49,8 @@ TuyaBLENumberIsAvailable = (
 
 
 TuyaBLENumberSetter = (
-    Callable[["TuyaBLENumber", TuyaBLEProductInfo, float], None] | None
+    Callable[["TuyaBLENumber", TuyaBLEProductInfo, float], Awaitable[None]]
+    | None
 )
 
 
@@ -104,10 +113,11 @@ def is_fingerbot_repeat_count_available(
         if datapoint:
             result = datapoint.value == 2
         if result:
-            datapoint = self._device.datapoints[product.fingerbot.program]
-            if datapoint and type(datapoint.value) is bytes:
-                repeat_count = int.from_bytes(datapoint.value[0:2], "big")
-                result = repeat_count != 0xFFFF
+            program = decode_fingerbot_program(
+                self._device.datapoints[product.fingerbot.program]
+            )
+            if program is not None:
+                result = program.repeat_count != 0xFFFF
 
     return result
 
@@ -118,15 +128,16 @@ def get_fingerbot_program_repeat_count(
 ) -> float | None:
     result: float | None = None
     if product.fingerbot and product.fingerbot.program:
-        datapoint = self._device.datapoints[product.fingerbot.program]
-        if datapoint and type(datapoint.value) is bytes:
-            repeat_count = int.from_bytes(datapoint.value[0:2], "big")
-            result = repeat_count * 1.0
+        program = decode_fingerbot_program(
+            self._device.datapoints[product.fingerbot.program]
+        )
+        if program is not None:
+            result = program.repeat_count * 1.0
 
     return result
 
 
-def set_fingerbot_program_repeat_count(
+async def set_fingerbot_program_repeat_count(
     self: TuyaBLENumber,
     product: TuyaBLEProductInfo,
     value: float,
@@ -134,11 +145,13 @@ def set_fingerbot_program_repeat_count(
     if product.fingerbot and product.fingerbot.program:
         datapoint = self._device.datapoints[product.fingerbot.program]
         if datapoint and type(datapoint.value) is bytes:
-            new_value = (
-                int.to_bytes(int(value), 2, "big") +
-                datapoint.value[2:]
+            repeat_count = int(value)
+            await self._async_edit_datapoint(
+                datapoint,
+                lambda program: FINGERBOT_PROGRAM_SCHEMA.update(
+                    program, repeat_count=repeat_count
+                ),
             )
-            self._hass.create_task(datapoint.set_value(new_value))
 
 
 def get_fingerbot_program_position(
@@ -147,14 +160,16 @@ def get_fingerbot_program_position(
 ) -> float | None:
     result: float | None = None
     if product.fingerbot and product.fingerbot.program:
-        datapoint = self._device.datapoints[product.fingerbot.program]
-        if datapoint and type(datapoint.value) is bytes:
-            result = datapoint.value[2] * 1.0
+        program = decode_fingerbot_program(
+            self._device.datapoints[product.fingerbot.program]
+        )
+        if program is not None:
+            result = program.idle_position * 1.0
 
     return result
 
 
-def set_fingerbot_program_position(
+async def set_fingerbot_program_position(
     self: TuyaBLENumber,
     product: TuyaBLEProductInfo,
     value: float,
@@ -162,9 +177,13 @@ def set_fingerbot_program_position(
     if product.fingerbot and product.fingerbot.program:
         datapoint = self._device.datapoints[product.fingerbot.program]
         if datapoint and type(datapoint.value) is bytes:
-            new_value = bytearray(datapoint.value)
-            new_value[2] = int(value)
-            self._hass.create_task(datapoint.set_value(new_value))
+            position = int(value)
+            await self._async_edit_datapoint(
+                datapoint,
+                lambda program: FINGERBOT_PROGRAM_SCHEMA.update(
+                    program, idle_position=position
+                ),
+            )
 
 
 @dataclass
@@ -481,18 +500,10 @@ mapping: dict[str, TuyaBLECategoryNumberMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLECategoryNumberMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLECategoryNumberMapping, ...]:
+    return get_device_mappings(device, Platform.NUMBER)
 
 
 class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
@@ -509,23 +520,37 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
         self._attr_mode = mapping.mode
+        self._decoder = self._compile_decoder()
+
+    def _compile_decoder(self) -> Callable[[], float | None]:
+        """Builds decoder doing only the work the mapping needs."""
+        getter = self._mapping.getter
+        if getter:
+            product = self._product
+            return lambda: getter(self, product)
+
+        datapoints = self._device.datapoints
+        dp_id = self._mapping.dp_id
+        coefficient = self._mapping.coefficient
+        default = self._mapping.description.native_min_value
+
+        def _decode() -> float | None:
+            datapoint = datapoints[dp_id]
+            if datapoint:
+                return datapoint.value / coefficient
+            return default
+
+        return _decode
 
     @property
     def native_value(self) -> float | None:
         """Return the entity value to represent the entity state."""
-        if self._mapping.getter:
-            return self._mapping.getter(self, self._product)
-
-        datapoint = self._device.datapoints[self._mapping.dp_id]
-        if datapoint:
-            return datapoint.value / self._mapping.coefficient
-
-        return self._mapping.description.native_min_value
+        return self._decoder()
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         if self._mapping.setter:
-            self._mapping.setter(self, self._product, value)
+            await self._mapping.setter(self, self._product, value)
             return
         int_value = int(value * self._mapping.coefficient)
         datapoint = self._device.datapoints.get_or_create(
@@ -534,7 +559,7 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
             int(int_value),
         )
         if datapoint:
-            self._hass.create_task(datapoint.set_value(int_value))
+            await self._async_set_datapoint(datapoint, int_value)
 
     @property
     def available(self) -> bool:
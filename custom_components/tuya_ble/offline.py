@@ -0,0 +1,54 @@
+"""The Tuya BLE integration."""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+
+from homeassistant.core import HomeAssistant, callback
+
+from .tuya_ble import (
+    AbstaractTuyaBLEDeviceManager,
+    TuyaBLEFileDeviceManager,
+    TuyaBLESQLiteDeviceManager,
+)
+
+from .const import DATA_OFFLINE_MANAGERS, SQLITE_EXTENSIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+OFFLINE_ERRORS = (OSError, ValueError, sqlite3.Error)
+
+
+@callback
+def get_offline_manager(
+    hass: HomeAssistant, path: str
+) -> AbstaractTuyaBLEDeviceManager:
+    """Get credentials manager of the file, shared by all devices using it."""
+    path = hass.config.path(path)
+    managers: dict[str, AbstaractTuyaBLEDeviceManager] = hass.data.setdefault(
+        DATA_OFFLINE_MANAGERS, {}
+    )
+    manager = managers.get(path)
+    if manager is None:
+        if os.path.splitext(path)[1].lower() in SQLITE_EXTENSIONS:
+            manager = TuyaBLESQLiteDeviceManager(path)
+        else:
+            manager = TuyaBLEFileDeviceManager(path)
+        managers[path] = manager
+    return manager
+
+
+async def async_validate_offline_path(hass: HomeAssistant, path: str) -> bool:
+    """Check that the credentials file exists and can be read."""
+    full_path = hass.config.path(path)
+    if not await hass.async_add_executor_job(os.path.isfile, full_path):
+        return False
+    manager = get_offline_manager(hass, path)
+    try:
+        # Any lookup loads the file or opens the database.
+        await manager.get_device_credentials("00:00:00:00:00:00", True)
+    except OFFLINE_ERRORS as ex:
+        _LOGGER.error("Reading credentials from %s failed: %s", path, ex)
+        return False
+    return True
@@ -0,0 +1,126 @@
+"""The Tuya BLE integration."""
+from __future__ import annotations
+
+import logging
+import time
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth.match import (
+    SERVICE_DATA_UUID,
+    BluetoothCallbackMatcher,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .tuya_ble import SERVICE_UUID
+
+from .cloud import HASSTuyaBLEDeviceManager
+from .const import DATA_PREFETCHER, DOMAIN, PREFETCH_REFRESH_INTERVAL
+from .devices import get_device_readable_name
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TuyaBLECredentialsPrefetcher:
+    """Resolves credentials of unconfigured Tuya BLE devices in background.
+
+    Watches advertisements of the Tuya BLE devices and puts credentials
+    of unconfigured ones into the cloud cache, so the config flow started
+    for the device later does not wait for the cloud.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._manager = HASSTuyaBLEDeviceManager(hass, {})
+        self._entry_ids: set[str] = set()
+        self._pending: set[str] = set()
+        self._names: dict[str, str] = {}
+        self._failed: dict[str, float] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_entry(self, entry_id: str) -> None:
+        self._entry_ids.add(entry_id)
+        if self._unsub is None:
+            _LOGGER.debug("Starting credentials prefetch")
+            self._unsub = bluetooth.async_register_callback(
+                self._hass,
+                self._async_discovered,
+                BluetoothCallbackMatcher({SERVICE_DATA_UUID: SERVICE_UUID}),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            )
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> bool:
+        """Remove entry, returns True if prefetcher is not used anymore."""
+        self._entry_ids.discard(entry_id)
+        if self._entry_ids:
+            return False
+        if self._unsub is not None:
+            _LOGGER.debug("Stopping credentials prefetch")
+            self._unsub()
+            self._unsub = None
+        return True
+
+    def get_readable_name(self, address: str) -> str | None:
+        return self._names.get(address)
+
+    @callback
+    def _async_discovered(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        address = service_info.address
+        if address in self._names or address in self._pending:
+            return
+        failed = self._failed.get(address)
+        if failed is not None and time.monotonic() - failed < PREFETCH_REFRESH_INTERVAL:
+            return
+        if self._hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, address
+        ):
+            return
+        self._pending.add(address)
+        self._hass.async_create_background_task(
+            self._async_prefetch(service_info),
+            "%s prefetch %s" % (DOMAIN, address),
+        )
+
+    async def _async_prefetch(
+        self, service_info: bluetooth.BluetoothServiceInfoBleak
+    ) -> None:
+        address = service_info.address
+        try:
+            if await self._manager.prefetch_device_credentials(address):
+                self._names[address] = await get_device_readable_name(
+                    service_info, self._manager
+                )
+                _LOGGER.debug(
+                    "%s: Prefetched credentials of %s",
+                    address,
+                    self._names[address],
+                )
+                self._failed.pop(address, None)
+            else:
+                self._failed[address] = time.monotonic()
+        except Exception:
+            self._failed[address] = time.monotonic()
+            _LOGGER.debug(
+                "%s: Prefetching credentials failed", address, exc_info=True
+            )
+        finally:
+            self._pending.discard(address)
+
+
+@callback
+def async_update_prefetcher(hass: HomeAssistant, entry_id: str, enabled: bool) -> None:
+    """Start or stop the prefetch on behalf of the config entry."""
+    prefetcher: TuyaBLECredentialsPrefetcher | None = hass.data.get(DATA_PREFETCHER)
+    if enabled:
+        if prefetcher is None:
+            prefetcher = TuyaBLECredentialsPrefetcher(hass)
+            hass.data[DATA_PREFETCHER] = prefetcher
+        prefetcher.async_add_entry(entry_id)
+    elif prefetcher is not None:
+        if prefetcher.async_remove_entry(entry_id):
+            hass.data.pop(DATA_PREFETCHER)
@@ -0,0 +1,149 @@
+"""The Tuya BLE integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping
+
+from homeassistant.const import Platform
+
+from .tuya_ble import TuyaBLEDevice
+
+if TYPE_CHECKING:
+    from .devices import TuyaBLEProductInfo
+
+# Platforms set up for every device, i.e. sensor always adds RSSI entity.
+ALWAYS_PLATFORMS: tuple[Platform, ...] = (Platform.SENSOR,)
+
+
+@dataclass(frozen=True)
+class TuyaBLEProductEntry:
+    """Everything known about a product: info and mappings of all platforms."""
+
+    info: TuyaBLEProductInfo | None = None
+    mappings: Mapping[Platform, tuple[Any, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    @property
+    def platforms(self) -> list[Platform]:
+        return [
+            platform
+            for platform, mappings in self.mappings.items()
+            if mappings or platform in ALWAYS_PLATFORMS
+        ]
+
+
+def _get_category_mappings(
+    category_mapping: Any, product_id: str | None
+) -> tuple[Any, ...]:
+    """Same lookup as the former per-platform get_mapping_by_device."""
+    if category_mapping is None or category_mapping.products is None:
+        return ()
+    product_mapping = category_mapping.products.get(product_id)
+    if product_mapping is not None:
+        return tuple(product_mapping)
+    if category_mapping.mapping is not None:
+        return tuple(category_mapping.mapping)
+    return ()
+
+
+def _get_platform_tables() -> dict[Platform, dict[str, Any]]:
+    from . import (
+        binary_sensor,
+        button,
+        climate,
+        cover,
+        number,
+        select,
+        sensor,
+        switch,
+        text,
+    )
+
+    return {
+        Platform.BUTTON: button.mapping,
+        Platform.CLIMATE: climate.mapping,
+        Platform.NUMBER: number.mapping,
+        Platform.SENSOR: sensor.mapping,
+        Platform.BINARY_SENSOR: binary_sensor.mapping,
+        Platform.SELECT: select.mapping,
+        Platform.SWITCH: switch.mapping,
+        Platform.TEXT: text.mapping,
+        Platform.COVER: cover.mapping,
+    }
+
+
+@cache
+def _get_registry() -> Mapping[tuple[str, str | None], TuyaBLEProductEntry]:
+    """Builds the registry keyed by (category, product_id) once.
+
+    Entry with None product_id holds the category defaults used for
+    products not listed in the tables.
+    """
+    from .devices import devices_database
+
+    tables = _get_platform_tables()
+    categories = set(devices_database)
+    for table in tables.values():
+        categories.update(table)
+
+    # Equal mapping tuples are shared between products.
+    shared: dict[tuple[Any, ...], tuple[Any, ...]] = {}
+
+    def _make_entry(category: str, product_id: str | None) -> TuyaBLEProductEntry:
+        category_info = devices_database.get(category)
+        info = None
+        if category_info is not None:
+            info = category_info.products.get(product_id, category_info.info)
+        mappings: dict[Platform, tuple[Any, ...]] = {}
+        for platform, table in tables.items():
+            platform_mappings = _get_category_mappings(
+                table.get(category), product_id
+            )
+            mappings[platform] = shared.setdefault(
+                tuple(map(id, platform_mappings)), platform_mappings
+            )
+        return TuyaBLEProductEntry(info, MappingProxyType(mappings))
+
+    result: dict[tuple[str, str | None], TuyaBLEProductEntry] = {}
+    for category in categories:
+        product_ids: set[str] = set()
+        category_info = devices_database.get(category)
+        if category_info is not None:
+            product_ids.update(category_info.products)
+        for table in tables.values():
+            category_mapping = table.get(category)
+            if category_mapping is not None and category_mapping.products:
+                product_ids.update(category_mapping.products)
+        for product_id in product_ids:
+            result[(category, product_id)] = _make_entry(category, product_id)
+        result[(category, None)] = _make_entry(category, None)
+
+    return MappingProxyType(result)
+
+
+_EMPTY_ENTRY = TuyaBLEProductEntry(
+    None, MappingProxyType({platform: () for platform in ALWAYS_PLATFORMS})
+)
+
+
+def get_product_entry(category: str, product_id: str) -> TuyaBLEProductEntry:
+    registry = _get_registry()
+    entry = registry.get((category, product_id))
+    if entry is None:
+        entry = registry.get((category, None), _EMPTY_ENTRY)
+    return entry
+
+
+def get_device_mappings(device: TuyaBLEDevice, platform: Platform) -> tuple[Any, ...]:
+    """Mappings of the platform for the device."""
+    return get_product_entry(device.category, device.product_id).mappings.get(
+        platform, ()
+    )
+
+
+def get_device_platforms(device: TuyaBLEDevice) -> list[Platform]:
+    """Platforms having at least one mapping for the device."""
+    return get_product_entry(device.category, device.product_id).platforms
@@ -0,0 +1,92 @@
+"""The Tuya BLE integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .tuya_ble import TuyaBLEDevice
+
+from .const import (
+    DATA_DATAPOINTS_STORE,
+    DATAPOINTS_SAVE_DELAY,
+    DATAPOINTS_STORAGE_KEY,
+    DATAPOINTS_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TuyaBLEDatapointsStore:
+    """Keeps last known datapoints of the devices across restarts.
+
+    Snapshots of all devices are kept in a single store and written with
+    a delay, so frequent updates of many devices are batched into one write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, DATAPOINTS_STORAGE_VERSION, DATAPOINTS_STORAGE_KEY
+        )
+        self._snapshots: dict[str, list[dict[str, Any]]] | None = None
+        self._devices: dict[str, TuyaBLEDevice] = {}
+        self._lock = asyncio.Lock()
+        self._save_pending = False
+
+    async def _async_load(self) -> dict[str, list[dict[str, Any]]]:
+        async with self._lock:
+            if self._snapshots is None:
+                data = await self._store.async_load()
+                self._snapshots = data.get("devices", {}) if data else {}
+            return self._snapshots
+
+    async def async_restore(self, device: TuyaBLEDevice) -> int:
+        """Restore datapoints of the device, returns count of restored ones."""
+        snapshots = await self._async_load()
+        self._devices[device.address] = device
+        records = snapshots.get(device.address)
+        if not records:
+            return 0
+        count = device.datapoints.restore_snapshot(records)
+        _LOGGER.debug("%s: Restored %s datapoints", device.address, count)
+        return count
+
+    @callback
+    def async_schedule_save(self) -> None:
+        # Delayed save is rescheduled by every call, so keep the pending one
+        # to write at most once per delay under a steady stream of updates.
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, DATAPOINTS_SAVE_DELAY)
+
+    async def async_remove_device(self, address: str, keep_snapshot: bool) -> None:
+        """Stop tracking the device, optionally dropping its snapshot."""
+        snapshots = await self._async_load()
+        device = self._devices.pop(address, None)
+        if not keep_snapshot:
+            snapshots.pop(address, None)
+        elif device is not None and len(device.datapoints) > 0:
+            snapshots[address] = device.datapoints.get_snapshot()
+        self.async_schedule_save()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        snapshots = self._snapshots if self._snapshots is not None else {}
+        for address, device in self._devices.items():
+            if len(device.datapoints) > 0:
+                snapshots[address] = device.datapoints.get_snapshot()
+        return {"devices": snapshots}
+
+
+@callback
+def get_datapoints_store(hass: HomeAssistant) -> TuyaBLEDatapointsStore:
+    store: TuyaBLEDatapointsStore | None = hass.data.get(DATA_DATAPOINTS_STORE)
+    if store is None:
+        store = TuyaBLEDatapointsStore(hass)
+        hass.data[DATA_DATAPOINTS_STORE] = store
+    return store
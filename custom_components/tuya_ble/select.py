@@ -10,7 +10,7 @@ from homeassistant.components.select import (
     SelectEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -23,6 +23,7 @@ from .const import (
     FINGERBOT_MODE_SWITCH,
 )
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -182,18 +183,8 @@ mapping: dict[str, TuyaBLECategorySelectMapping] = {
 
 def get_mapping_by_device(
     device: TuyaBLEDevice
-) -> list[TuyaBLECategorySelectMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+) -> tuple[TuyaBLECategorySelectMapping, ...]:
+    return get_device_mappings(device, Platform.SELECT)
 
 
 class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
@@ -231,7 +222,7 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
                 return value
         return None
 
-    def select_option(self, value: str) -> None:
+    async def async_select_option(self, value: str) -> None:
         """Change the selected option."""
         if value in self._attr_options:
             int_value = self._attr_options.index(value)
@@ -241,7 +232,7 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
                 int_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(int_value))
+                await self._async_set_datapoint(datapoint, int_value)
 
 
 async def async_setup_entry(
@@ -2,7 +2,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 import logging
-from typing import Callable
+from typing import Any, Callable
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -15,6 +15,7 @@ from homeassistant.const import (
     PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     UnitOfTemperature,
+    Platform,
     UnitOfTime,
     UnitOfVolume
 )
@@ -33,7 +34,13 @@ from .const import (
     CO2_LEVEL_NORMAL,
     DOMAIN,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    TuyaBLEValueThrottle,
+)
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 _LOGGER = logging.getLogger(__name__)
 SIGNAL_STRENGTH_DP_ID = -1
@@ -48,6 +55,9 @@ class TuyaBLESensorMapping:
     coefficient: float = 1.0
     icons: list[str] | None = None
     is_available: TuyaBLESensorIsAvailable = None
+    deadband: float = 0
+    deadband_percent: bool = False
+    min_interval: float = 0
 @dataclass
 class TuyaBLEBatteryMapping(TuyaBLESensorMapping):
     description: SensorEntityDescription = field(
@@ -108,9 +118,16 @@ mapping: dict[str, TuyaBLECategorySensorMapping] = {
                         native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
                         state_class=SensorStateClass.MEASUREMENT,
                     ),
+                    deadband=2,
+                    deadband_percent=True,
+                    min_interval=30,
                 ),
                 TuyaBLEBatteryMapping(dp_id=15),
-                TuyaBLETemperatureMapping(dp_id=18),
+                TuyaBLETemperatureMapping(
+                    dp_id=18,
+                    deadband=0.2,
+                    min_interval=30,
+                ),
                 TuyaBLESensorMapping(
                     dp_id=19,
                     description=SensorEntityDescription(
@@ -119,6 +136,8 @@ mapping: dict[str, TuyaBLECategorySensorMapping] = {
                         native_unit_of_measurement=PERCENTAGE,
                         state_class=SensorStateClass.MEASUREMENT,
                     ),
+                    deadband=1,
+                    min_interval=30,
                 ),
             ]
         }
@@ -406,18 +425,31 @@ rssi_mapping = TuyaBLESensorMapping(
     ),
     getter=rssi_getter,
 )
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLESensorMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+TuyaBLESensorDecoder = Callable[["TuyaBLESensor", Any], None]
+def _decode_value(sensor: TuyaBLESensor, value: Any) -> None:
+    sensor._attr_native_value = value
+def _decode_nothing(sensor: TuyaBLESensor, value: Any) -> None:
+    pass
+def compile_sensor_decoder(
+    mapping: TuyaBLESensorMapping, type: TuyaBLEDataPointType
+) -> TuyaBLESensorDecoder:
+    """Builds decoder doing only the work the mapping needs for the dp type."""
+    if type == TuyaBLEDataPointType.DT_VALUE:
+        coefficient = mapping.coefficient
+        def _decode_scaled(sensor: TuyaBLESensor, value: Any) -> None:
+            sensor._attr_native_value = value / coefficient
+        return _decode_scaled
+    if type != TuyaBLEDataPointType.DT_ENUM:
+        return _decode_value
+    options = mapping.description.options
+    if options is None:
+        return _decode_nothing
+    options_map = dict(enumerate(options))
+    def _decode_options(sensor: TuyaBLESensor, value: Any) -> None:
+        sensor._attr_native_value = options_map.get(value, value)
+    return _decode_options
+def get_mapping_by_device(device: TuyaBLEDevice) -> tuple[TuyaBLESensorMapping, ...]:
+    return get_device_mappings(device, Platform.SENSOR)
 class TuyaBLESensor(TuyaBLEEntity, SensorEntity):
     """Representation of a Tuya BLE sensor."""
     def __init__(
@@ -430,6 +462,37 @@ class TuyaBLESensor(TuyaBLEEntity, SensorEntity):
     ) -> None:
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
+        self._decoder_type = mapping.dp_type
+        self._decoder: TuyaBLESensorDecoder | None = None
+        if mapping.getter is None and mapping.dp_type is not None:
+            self._decoder = compile_sensor_decoder(mapping, mapping.dp_type)
+        self._throttle: TuyaBLEValueThrottle | None = None
+        if mapping.deadband or mapping.min_interval:
+            self._throttle = TuyaBLEValueThrottle(
+                hass,
+                mapping.deadband,
+                mapping.deadband_percent,
+                mapping.min_interval,
+                self._async_publish_value,
+            )
+            self.async_on_remove(self._throttle.async_cancel)
+        # Raw value held back by the throttle, its icon is set when published
+        self._held_value: Any = None
+    def _update_icon(self, value: Any) -> None:
+        icons = self._mapping.icons
+        if (
+            icons is not None
+            and self._decoder_type == TuyaBLEDataPointType.DT_ENUM
+            and 0 <= value < len(icons)
+        ):
+            self._attr_icon = icons[value]
+    @callback
+    def _async_publish_value(self, value: Any) -> None:
+        self._attr_native_value = value
+        if self._held_value is not None:
+            self._update_icon(self._held_value)
+            self._held_value = None
+        self.async_write_ha_state_if_changed()
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -438,28 +501,22 @@ class TuyaBLESensor(TuyaBLEEntity, SensorEntity):
         else:
             datapoint = self._device.datapoints[self._mapping.dp_id]
             if datapoint:
-                if datapoint.type == TuyaBLEDataPointType.DT_ENUM:
-                    if self.entity_description.options is not None:
-                        if datapoint.value >= 0 and datapoint.value < len(
-                            self.entity_description.options
-                        ):
-                            self._attr_native_value = self.entity_description.options[
-                                datapoint.value
-                            ]
-                        else:
-                            self._attr_native_value = datapoint.value
-                    if self._mapping.icons is not None:
-                        if datapoint.value >= 0 and datapoint.value < len(
-                            self._mapping.icons
-                        ):
-                            self._attr_icon = self._mapping.icons[datapoint.value]
-                elif datapoint.type == TuyaBLEDataPointType.DT_VALUE:
-                    self._attr_native_value = (
-                        datapoint.value / self._mapping.coefficient
+                if self._decoder is None or datapoint.type != self._decoder_type:
+                    self._decoder = compile_sensor_decoder(
+                        self._mapping, datapoint.type
                     )
+                    self._decoder_type = datapoint.type
+                previous = self._attr_native_value
+                self._decoder(self, datapoint.value)
+                if self._throttle is not None and not self._throttle.async_update(
+                    self._attr_native_value
+                ):
+                    self._attr_native_value = previous
+                    self._held_value = datapoint.value
                 else:
-                    self._attr_native_value = datapoint.value
-        self.async_write_ha_state()
+                    self._held_value = None
+                    self._update_icon(datapoint.value)
+        self.async_write_ha_state_if_changed()
     @property
     def available(self) -> bool:
         """Return if entity is available."""
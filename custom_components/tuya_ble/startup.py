@@ -0,0 +1,208 @@
+"""The Tuya BLE integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import time
+from typing import Callable
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .tuya_ble import TuyaBLEDevice
+
+from .const import (
+    DATA_STARTUP_PLANNER,
+    DOMAIN,
+    STARTUP_GRACE,
+    STARTUP_PRIORITY_CATEGORIES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TuyaBLEStartupStats:
+    devices: int = 0
+    available: int = 0
+    unavailable: int = 0
+    total_time: float | None = None
+
+
+@dataclass
+class _TuyaBLEStartupItem:
+    device: TuyaBLEDevice
+    ramp: float
+    unsub_connected: Callable[[], None] | None = None
+    unsub_call: CALLBACK_TYPE | None = None
+
+
+class TuyaBLEStartupPlanner:
+    """Orders and spreads initial connections of the devices at startup.
+
+    Devices set up before Home Assistant is started are connected once it
+    is started: latency-critical categories first, then the rest by signal
+    strength, each spread over the ramp of its entry, so they do not all
+    compete for the connection lock at once. Startup is over when all of
+    them are available or when the longest ramp and a grace time pass.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._items: dict[str, _TuyaBLEStartupItem] = {}
+        self._started: float | None = None
+        self._unsub_start: CALLBACK_TYPE | None = None
+        self._unsub_window: CALLBACK_TYPE | None = None
+        self.stats = TuyaBLEStartupStats()
+
+    @callback
+    def async_add_device(
+        self, entry_id: str, device: TuyaBLEDevice, ramp: float
+    ) -> None:
+        if self._hass.is_running:
+            self._hass.async_create_task(device.update())
+            return
+        item = _TuyaBLEStartupItem(device, ramp)
+        item.unsub_connected = device.register_connected_callback(
+            lambda: self._async_device_available(entry_id)
+        )
+        self._items[entry_id] = item
+        self.stats.devices += 1
+        if self._unsub_start is None:
+            self._unsub_start = self._hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED, self._async_start
+            )
+
+    @callback
+    def async_remove_device(self, entry_id: str) -> None:
+        item = self._items.pop(entry_id, None)
+        if item is not None:
+            self._release_item(item)
+            self.stats.devices -= 1
+        if not self._items and self._unsub_start is not None:
+            self._unsub_start()
+            self._unsub_start = None
+        if not self._items and self._unsub_window is not None:
+            self._async_finish()
+
+    @staticmethod
+    def _release_item(item: _TuyaBLEStartupItem) -> None:
+        if item.unsub_connected is not None:
+            item.unsub_connected()
+            item.unsub_connected = None
+        if item.unsub_call is not None:
+            item.unsub_call()
+            item.unsub_call = None
+
+    @staticmethod
+    def _get_priority(item: _TuyaBLEStartupItem) -> tuple[int, int]:
+        category = item.device.category
+        rssi = item.device.rssi
+        return (
+            0 if category in STARTUP_PRIORITY_CATEGORIES else 1,
+            -rssi if rssi is not None else 0,
+        )
+
+    @callback
+    def _async_start(self, event: Event) -> None:
+        self._unsub_start = None
+        self._started = time.monotonic()
+        plan = sorted(
+            self._items.items(), key=lambda pair: self._get_priority(pair[1])
+        )
+        critical = [
+            pair
+            for pair in plan
+            if pair[1].device.category in STARTUP_PRIORITY_CATEGORIES
+        ]
+        rest = plan[len(critical):]
+        ramp = max((item.ramp for _, item in plan), default=0)
+        _LOGGER.debug(
+            "Connecting %s devices, %s immediately, rest over up to %s s",
+            len(plan),
+            len(critical),
+            ramp,
+        )
+        for _, item in critical:
+            self._hass.async_create_task(item.device.update())
+        for index, (entry_id, item) in enumerate(rest):
+            delay = item.ramp * index / len(rest)
+            item.unsub_call = async_call_later(
+                self._hass, delay, self._make_connect(entry_id)
+            )
+        self._unsub_window = async_call_later(
+            self._hass, ramp + STARTUP_GRACE, self._async_window_end
+        )
+
+    def _make_connect(self, entry_id: str) -> Callable[[float], None]:
+        @callback
+        def _async_connect(_: float) -> None:
+            item = self._items.get(entry_id)
+            if item is not None:
+                item.unsub_call = None
+                self._hass.async_create_task(item.device.update())
+
+        return _async_connect
+
+    @callback
+    def _async_device_available(self, entry_id: str) -> None:
+        item = self._items.pop(entry_id, None)
+        if item is None:
+            return
+        self._release_item(item)
+        self.stats.available += 1
+        if not self._items and self._unsub_window is not None:
+            self._async_finish()
+
+    @callback
+    def _async_window_end(self, _: float) -> None:
+        self._unsub_window = None
+        self._async_finish()
+
+    @callback
+    def _async_finish(self) -> None:
+        if self._unsub_window is not None:
+            self._unsub_window()
+            self._unsub_window = None
+        self.stats.total_time = time.monotonic() - self._started
+        self.stats.unavailable = len(self._items)
+        for item in self._items.values():
+            self._release_item(item)
+        self._items.clear()
+        if self.stats.unavailable:
+            _LOGGER.info(
+                "%s of %s %s devices available in %.1f s, %s did not connect",
+                self.stats.available,
+                self.stats.devices,
+                DOMAIN,
+                self.stats.total_time,
+                self.stats.unavailable,
+            )
+        else:
+            _LOGGER.info(
+                "All %s %s devices available in %.1f s",
+                self.stats.available,
+                DOMAIN,
+                self.stats.total_time,
+            )
+
+
+@callback
+def async_plan_device_startup(
+    hass: HomeAssistant, entry_id: str, device: TuyaBLEDevice, ramp: float
+) -> None:
+    """Schedule the initial connection of the device."""
+    planner: TuyaBLEStartupPlanner | None = hass.data.get(DATA_STARTUP_PLANNER)
+    if planner is None:
+        planner = TuyaBLEStartupPlanner(hass)
+        hass.data[DATA_STARTUP_PLANNER] = planner
+    planner.async_add_device(entry_id, device, ramp)
+
+
+@callback
+def async_cancel_device_startup(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget the device scheduled for the initial connection."""
+    planner: TuyaBLEStartupPlanner | None = hass.data.get(DATA_STARTUP_PLANNER)
+    if planner is not None:
+        planner.async_remove_device(entry_id)
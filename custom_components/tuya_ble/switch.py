@@ -4,20 +4,28 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 import logging
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 from homeassistant.components.switch import (
     SwitchEntityDescription,
     SwitchEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    FINGERBOT_PROGRAM_SCHEMA,
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    decode_fingerbot_program,
+)
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,7 +42,7 @@ TuyaBLESwitchIsAvailable = (
 
 
 TuyaBLESwitchSetter = (
-    Callable[["TuyaBLESwitch", TuyaBLEProductInfo, bool], None] | None
+    Callable[["TuyaBLESwitch", TuyaBLEProductInfo, bool], Awaitable[None]] | None
 )
 
 
@@ -77,24 +85,27 @@ def get_fingerbot_program_repeat_forever(
 ) -> bool | None:
     result: bool | None = None
     if product.fingerbot and product.fingerbot.program:
-        datapoint = self._device.datapoints[product.fingerbot.program]
-        if datapoint and type(datapoint.value) is bytes:
-            repeat_count = int.from_bytes(datapoint.value[0:2], "big")
-            result = repeat_count == 0xFFFF
+        program = decode_fingerbot_program(
+            self._device.datapoints[product.fingerbot.program]
+        )
+        if program is not None:
+            result = program.repeat_count == 0xFFFF
     return result
 
 
-def set_fingerbot_program_repeat_forever(
+async def set_fingerbot_program_repeat_forever(
     self: TuyaBLESwitch, product: TuyaBLEProductInfo, value: bool
 ) -> None:
     if product.fingerbot and product.fingerbot.program:
         datapoint = self._device.datapoints[product.fingerbot.program]
         if datapoint and type(datapoint.value) is bytes:
-            new_value = (
-                int.to_bytes(0xFFFF if value else 1, 2, "big") + 
-                datapoint.value[2:]
+            repeat_count = 0xFFFF if value else 1
+            await self._async_edit_datapoint(
+                datapoint,
+                lambda program: FINGERBOT_PROGRAM_SCHEMA.update(
+                    program, repeat_count=repeat_count
+                ),
             )
-            self._hass.create_task(datapoint.set_value(new_value))
 
 
 @dataclass
@@ -356,18 +367,10 @@ mapping: dict[str, TuyaBLECategorySwitchMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLECategorySwitchMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(
+    device: TuyaBLEDevice
+) -> tuple[TuyaBLECategorySwitchMapping, ...]:
+    return get_device_mappings(device, Platform.SWITCH)
 
 
 class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
@@ -407,12 +410,11 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
                 return bool(datapoint.value)
         return False
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         if self._mapping.setter:
-            return self._mapping.setter(self, self._product, True)
+            return await self._mapping.setter(self, self._product, True)
 
-        new_value: bool | bytes
         if self._mapping.bitmap_mask:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.dp_id,
@@ -420,26 +422,29 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
                 self._mapping.bitmap_mask,
             )
             bitmap_mask = self._mapping.bitmap_mask
-            bitmap_value = bytes(datapoint.value)
-            new_value = bytes(
-                v | m for (v, m) in zip(bitmap_value, bitmap_mask, strict=True)
-            )
+            if datapoint:
+                # Merged with concurrent edits of other bits of the bitmap.
+                await self._async_edit_datapoint(
+                    datapoint,
+                    lambda bitmap_value: bytes(
+                        v | m
+                        for (v, m) in zip(bitmap_value, bitmap_mask, strict=True)
+                    ),
+                )
         else:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.dp_id,
                 TuyaBLEDataPointType.DT_BOOL,
                 True,
             )
-            new_value = True
-        if datapoint:
-            self._hass.create_task(datapoint.set_value(new_value))
+            if datapoint:
+                await self._async_set_datapoint(datapoint, True)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         if self._mapping.setter:
-            return self._mapping.setter(self, self._product, False)
+            return await self._mapping.setter(self, self._product, False)
 
-        new_value: bool | bytes
         if self._mapping.bitmap_mask:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.dp_id,
@@ -447,19 +452,23 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
                 self._mapping.bitmap_mask,
             )
             bitmap_mask = self._mapping.bitmap_mask
-            bitmap_value = bytes(datapoint.value)
-            new_value = bytes(
-                v & ~m for (v, m) in zip(bitmap_value, bitmap_mask, strict=True)
-            )
+            if datapoint:
+                # Merged with concurrent edits of other bits of the bitmap.
+                await self._async_edit_datapoint(
+                    datapoint,
+                    lambda bitmap_value: bytes(
+                        v & ~m
+                        for (v, m) in zip(bitmap_value, bitmap_mask, strict=True)
+                    ),
+                )
         else:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.dp_id,
                 TuyaBLEDataPointType.DT_BOOL,
                 False,
             )
-            new_value = False
-        if datapoint:
-            self._hass.create_task(datapoint.set_value(new_value))
+            if datapoint:
+                await self._async_set_datapoint(datapoint, False)
 
     @property
     def available(self) -> bool:
@@ -4,14 +4,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import logging
-from struct import pack, unpack
-from typing import Callable
+from typing import Awaitable, Callable
 
 from homeassistant.components.text import (
     TextEntity,
     TextEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -20,7 +20,14 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
     DOMAIN,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    FINGERBOT_PROGRAM_SCHEMA,
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    decode_fingerbot_program,
+)
+from .registry import get_device_mappings
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,7 +45,7 @@ TuyaBLETextIsAvailable = (
 
 
 TuyaBLETextSetter = (
-    Callable[["TuyaBLEText", TuyaBLEProductInfo, str], None] | None
+    Callable[["TuyaBLEText", TuyaBLEProductInfo, str], Awaitable[None]] | None
 )
 
 
@@ -58,27 +65,21 @@ def get_fingerbot_program(
     self: TuyaBLEText,
     product: TuyaBLEProductInfo,
 ) -> str | None:
-    result: float | None = None
+    result: str | None = None
     if product.fingerbot and product.fingerbot.program:
-        datapoint = self._device.datapoints[product.fingerbot.program]
-        if datapoint and type(datapoint.value) is bytes:
-            result = ""
-            step_count: int = datapoint.value[3]
-            for step in range(step_count):
-                step_pos = 4 + step * 3
-                step_data = datapoint.value[step_pos:step_pos+3]
-                position, delay = unpack(">BH", step_data)
-                if delay > 9999:
-                    delay = 9999
-                result += (
-                    (';' if step > 0 else '') +
-                    str(position) +
-                    (('/' + str(delay)) if delay > 0 else '')
-                )
+        program = decode_fingerbot_program(
+            self._device.datapoints[product.fingerbot.program]
+        )
+        if program is not None:
+            result = ";".join(
+                str(step.position)
+                + (("/" + str(min(step.delay, 9999))) if step.delay > 0 else "")
+                for step in program.steps
+            )
     return result
 
 
-def set_fingerbot_program(
+async def set_fingerbot_program(
     self: TuyaBLEText,
     product: TuyaBLEProductInfo,
     value: str,
@@ -86,15 +87,21 @@ def set_fingerbot_program(
     if product.fingerbot and product.fingerbot.program:
         datapoint = self._device.datapoints[product.fingerbot.program]
         if datapoint and type(datapoint.value) is bytes:
-            new_value = bytearray(datapoint.value[0:3])
-            steps = value.split(';')
-            new_value += int.to_bytes(len(steps), 1, "big")
-            for step in steps:
+            steps = []
+            for step in value.split(';'):
                 step_values = step.split('/')
-                position = int(step_values[0])
-                delay = int(step_values[1]) if len(step_values) > 1 else 0
-                new_value += pack(">BH", position, delay)
-            self._hass.create_task(datapoint.set_value(new_value))
+                steps.append(
+                    FINGERBOT_PROGRAM_SCHEMA.make_record(
+                        position=int(step_values[0]),
+                        delay=int(step_values[1]) if len(step_values) > 1 else 0,
+                    )
+                )
+            await self._async_edit_datapoint(
+                datapoint,
+                lambda program: FINGERBOT_PROGRAM_SCHEMA.update(
+                    program, steps=tuple(steps)
+                ),
+            )
 
 
 @dataclass
@@ -106,7 +113,7 @@ class TuyaBLETextMapping:
     default_value: str | None = None
     is_available: TuyaBLETextIsAvailable = None
     getter: Callable[[TuyaBLEText], None] | None = None
-    setter: Callable[[TuyaBLEText], None] | None = None
+    setter: TuyaBLETextSetter = None
 
 
 @dataclass
@@ -146,18 +153,8 @@ mapping: dict[str, TuyaBLECategoryTextMapping] = {
 }
 
 
-def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLETextMapping]:
-    category = mapping.get(device.category)
-    if category is not None and category.products is not None:
-        product_mapping = category.products.get(device.product_id)
-        if product_mapping is not None:
-            return product_mapping
-        if category.mapping is not None:
-            return category.mapping
-        else:
-            return []
-    else:
-        return []
+def get_mapping_by_device(device: TuyaBLEDevice) -> tuple[TuyaBLETextMapping, ...]:
+    return get_device_mappings(device, Platform.TEXT)
 
 
 class TuyaBLEText(TuyaBLEEntity, TextEntity):
@@ -194,10 +191,10 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
 
         return self._mapping.description.default_value
 
-    def set_value(self, value: str) -> None:
+    async def async_set_value(self, value: str) -> None:
         """Change the value."""
         if self._mapping.setter:
-            self._mapping.setter(self, self._product, value)
+            await self._mapping.setter(self, self._product, value)
             return
         datapoint = self._device.datapoints.get_or_create(
             self._mapping.dp_id,
@@ -205,7 +202,7 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
             value,
         )
         if datapoint:
-            self._hass.create_task(datapoint.set_value(value))
+            await self._async_set_datapoint(datapoint, value)
 
 
 async def async_setup_entry(
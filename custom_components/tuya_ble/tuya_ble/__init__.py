@@ -3,21 +3,42 @@ from __future__ import annotations
 __version__ = "0.1.0"
 
 
+from .ack_tracker import TuyaBLEAckStats
 from .const import (
     SERVICE_UUID,
     TuyaBLEDataPointType, 
 )
+from .exceptions import TuyaBLEError, TuyaBLEResponseTimeoutError
 from .manager import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDeviceCredentials,
 )
+from .raw_schema import (
+    TuyaBLERawBitfield,
+    TuyaBLERawField,
+    TuyaBLERawRecords,
+    TuyaBLERawSchema,
+)
+from .offline_manager import (
+    TuyaBLEFileDeviceManager,
+    TuyaBLESQLiteDeviceManager,
+)
 from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDevice 
 
 __all__ = [
     "AbstaractTuyaBLEDeviceManager",
+    "TuyaBLEAckStats",
     "TuyaBLEDataPoint",
     "TuyaBLEDataPointType",
     "TuyaBLEDevice",
     "TuyaBLEDeviceCredentials",
+    "TuyaBLEError",
+    "TuyaBLEFileDeviceManager",
+    "TuyaBLERawBitfield",
+    "TuyaBLERawField",
+    "TuyaBLERawRecords",
+    "TuyaBLERawSchema",
+    "TuyaBLEResponseTimeoutError",
+    "TuyaBLESQLiteDeviceManager",
     "SERVICE_UUID",
 ]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import ACK_RESYNCS, ACK_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TuyaBLEPendingAck:
+    dp_id: int
+    sent: float
+    deadline: float
+    resyncs: int = 0
+
+
+@dataclass
+class TuyaBLEAckStats:
+    acked: int = 0
+    resyncs: int = 0
+    missed: int = 0
+    total_latency: float = 0
+    max_latency: float = 0
+    last_latency: float | None = None
+
+    @property
+    def average_latency(self) -> float | None:
+        if self.acked == 0:
+            return None
+        return self.total_latency / self.acked
+
+
+class TuyaBLEAckTracker:
+    """Tracks echoes of the datapoints written to the device.
+
+    Every written datapoint is recorded with a deadline, any report of the
+    datapoint by the device confirms the write, like write_pending state of
+    the datapoint. Status of the device is requested only when an echo is
+    missing at the deadline, the write is given up after ACK_RESYNCS requests.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        resync: Callable[[], Awaitable[None]],
+        timeout: float = ACK_TIMEOUT,
+        resyncs: int = ACK_RESYNCS,
+    ) -> None:
+        self._address = address
+        self._resync = resync
+        self._timeout = timeout
+        self._resyncs = resyncs
+        self._pending: dict[int, TuyaBLEPendingAck] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._resync_task: asyncio.Task | None = None
+        self.stats = TuyaBLEAckStats()
+
+    def track(self, dp_id: int) -> None:
+        now = time.monotonic()
+        self._pending[dp_id] = TuyaBLEPendingAck(dp_id, now, now + self._timeout)
+        self._schedule()
+
+    def discard(self, dp_ids: Iterable[int]) -> None:
+        """Stop tracking the writes that were not sent."""
+        for dp_id in dp_ids:
+            self._pending.pop(dp_id, None)
+        if not self._pending:
+            self.cancel()
+
+    def is_pending(self, dp_id: int) -> bool:
+        return dp_id in self._pending
+
+    def handle_datapoints(self, datapoints: Iterable[Any]) -> None:
+        """Match datapoint updates received from the device with the writes."""
+        if not self._pending:
+            return
+        now = time.monotonic()
+        for datapoint in datapoints:
+            pending = self._pending.pop(datapoint.id, None)
+            if pending is None:
+                continue
+            latency = now - pending.sent
+            self.stats.acked += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            self.stats.last_latency = latency
+            _LOGGER.debug(
+                "%s: Datapoint %s echoed in %.3f s",
+                self._address,
+                datapoint.id,
+                latency,
+            )
+        if not self._pending:
+            self.cancel()
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def clear(self) -> None:
+        self.cancel()
+        self._pending.clear()
+
+    def _schedule(self) -> None:
+        self.cancel()
+        if self._pending:
+            deadline = min(pending.deadline for pending in self._pending.values())
+            self._handle = asyncio.get_running_loop().call_later(
+                max(deadline - time.monotonic(), 0), self._check
+            )
+
+    def _check(self) -> None:
+        self._handle = None
+        now = time.monotonic()
+        resync = False
+        for dp_id, pending in list(self._pending.items()):
+            if pending.deadline > now:
+                continue
+            if pending.resyncs >= self._resyncs:
+                del self._pending[dp_id]
+                self.stats.missed += 1
+                _LOGGER.debug(
+                    "%s: No echo of datapoint %s from device", self._address, dp_id
+                )
+                continue
+            pending.resyncs += 1
+            pending.deadline = now + self._timeout
+            resync = True
+
+        if resync and (self._resync_task is None or self._resync_task.done()):
+            _LOGGER.debug(
+                "%s: Missing datapoint echo, requesting status", self._address
+            )
+            self.stats.resyncs += 1
+            self._resync_task = asyncio.create_task(self._async_resync())
+        self._schedule()
+
+    async def _async_resync(self) -> None:
+        try:
+            await self._resync()
+        except Exception:
+            _LOGGER.debug(
+                "%s: Requesting status failed", self._address, exc_info=True
+            )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from struct import Struct
+from typing import TYPE_CHECKING, Any
+
+from .const import TuyaBLEDataPointType
+from .exceptions import TuyaBLEDataFormatError, TuyaBLEDataLengthError
+
+if TYPE_CHECKING:
+    from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDataPoints
+
+# Datapoint types indexed by their value on the wire
+DP_TYPES: tuple[TuyaBLEDataPointType, ...] = tuple(
+    sorted(TuyaBLEDataPointType, key=lambda dp_type: dp_type.value)
+)
+
+_HEADER_V3 = Struct(">BBB")
+_HEADER_V4 = Struct(">BBH")
+_BOOL_VALUES = (b"\x00", b"\x01")
+_INT32 = Struct(">i")
+# Width of enum value on the wire indexed by its bit length
+_ENUM_WIDTHS = tuple(
+    1 if bits <= 8 else 2 if bits <= 16 else 4 for bits in range(33)
+)
+
+
+def _decode_raw(raw: memoryview) -> bytes:
+    return raw.tobytes()
+
+
+def _decode_bool(raw: memoryview) -> bool:
+    return any(raw)
+
+
+def _decode_int(raw: memoryview) -> int:
+    return int.from_bytes(raw, "big", signed=True)
+
+
+def _decode_uint(raw: memoryview) -> int:
+    return int.from_bytes(raw, "big")
+
+
+def _decode_string(raw: memoryview) -> str:
+    return str(raw, "utf-8")
+
+
+def _encode_raw(value: Any) -> bytes:
+    return bytes(value)
+
+
+def _encode_bool(value: Any) -> bytes:
+    return _BOOL_VALUES[1 if value else 0]
+
+
+def _encode_value(value: Any) -> bytes:
+    return _INT32.pack(value)
+
+
+def _encode_enum(value: Any) -> bytes:
+    return value.to_bytes(_ENUM_WIDTHS[value.bit_length()], "big")
+
+
+def _encode_string(value: Any) -> bytes:
+    return value.encode()
+
+
+_DECODERS: dict[TuyaBLEDataPointType, Callable[[memoryview], Any]] = {
+    TuyaBLEDataPointType.DT_RAW: _decode_raw,
+    TuyaBLEDataPointType.DT_BOOL: _decode_bool,
+    TuyaBLEDataPointType.DT_VALUE: _decode_int,
+    TuyaBLEDataPointType.DT_STRING: _decode_string,
+    TuyaBLEDataPointType.DT_ENUM: _decode_uint,
+    TuyaBLEDataPointType.DT_BITMAP: _decode_raw,
+}
+
+_ENCODERS: dict[TuyaBLEDataPointType, Callable[[Any], bytes]] = {
+    TuyaBLEDataPointType.DT_RAW: _encode_raw,
+    TuyaBLEDataPointType.DT_BOOL: _encode_bool,
+    TuyaBLEDataPointType.DT_VALUE: _encode_value,
+    TuyaBLEDataPointType.DT_STRING: _encode_string,
+    TuyaBLEDataPointType.DT_ENUM: _encode_enum,
+    TuyaBLEDataPointType.DT_BITMAP: _encode_raw,
+}
+
+# Type and decoder of the datapoint indexed by type value on the wire
+_DECODE_TABLE: tuple[
+    tuple[TuyaBLEDataPointType, Callable[[memoryview], Any]], ...
+] = tuple((dp_type, _DECODERS[dp_type]) for dp_type in DP_TYPES)
+
+
+def decode_value(dp_type: TuyaBLEDataPointType, raw: bytes) -> Any:
+    return _DECODERS[dp_type](memoryview(raw))
+
+
+def encode_value(dp_type: TuyaBLEDataPointType, value: Any) -> bytes:
+    return _ENCODERS[dp_type](value)
+
+
+def parse_datapoints_v3(
+    datapoints: TuyaBLEDataPoints,
+    timestamp: float,
+    flags: int,
+    data: bytes,
+    start_pos: int,
+) -> list[TuyaBLEDataPoint]:
+    """Update datapoints from v3 payload, returns the updated datapoints.
+
+    Every datapoint is encoded as id, type, 1 byte length and the value.
+    """
+    result: list[TuyaBLEDataPoint] = []
+    view = memoryview(data)
+    data_len = len(data)
+    decode_table = _DECODE_TABLE
+    types_count = len(decode_table)
+    update = datapoints._update_from_device
+    pos = start_pos
+    while data_len - pos >= 4:
+        dp_id = data[pos]
+        type_value = data[pos + 1]
+        next_pos = pos + 3 + data[pos + 2]
+        if type_value >= types_count:
+            raise TuyaBLEDataFormatError()
+        if next_pos > data_len:
+            raise TuyaBLEDataLengthError()
+        dp_type, decoder = decode_table[type_value]
+        value = decoder(view[pos + 3 : next_pos])
+        result.append(update(dp_id, timestamp, flags, dp_type, value))
+        pos = next_pos
+    return result
+
+
+def parse_datapoints_v4(
+    datapoints: TuyaBLEDataPoints,
+    timestamp: float,
+    flags: int,
+    data: bytes,
+    start_pos: int,
+) -> list[TuyaBLEDataPoint]:
+    """Update datapoints from v4 payload, returns the updated datapoints.
+
+    Every datapoint is encoded as id, type, 2 bytes length and the value.
+    """
+    result: list[TuyaBLEDataPoint] = []
+    view = memoryview(data)
+    data_len = len(data)
+    decode_table = _DECODE_TABLE
+    types_count = len(decode_table)
+    unpack_header = _HEADER_V4.unpack_from
+    update = datapoints._update_from_device
+    pos = start_pos
+    while data_len - pos >= 5:
+        dp_id, type_value, value_len = unpack_header(data, pos)
+        next_pos = pos + 4 + value_len
+        if type_value >= types_count:
+            raise TuyaBLEDataFormatError()
+        if next_pos > data_len:
+            raise TuyaBLEDataLengthError()
+        dp_type, decoder = decode_table[type_value]
+        value = decoder(view[pos + 4 : next_pos])
+        result.append(update(dp_id, timestamp, flags, dp_type, value))
+        pos = next_pos
+    return result
+
+
+def _encode_datapoints(
+    datapoints: Iterable[TuyaBLEDataPoint], header: Struct
+) -> bytearray:
+    data = bytearray()
+    pack_header = header.pack
+    encoders = _ENCODERS
+    for datapoint in datapoints:
+        dp_type = datapoint.type
+        value = encoders[dp_type](datapoint.value)
+        data += pack_header(datapoint.id, dp_type.value, len(value))
+        data += value
+    return data
+
+
+def encode_datapoints_v3(datapoints: Iterable[TuyaBLEDataPoint]) -> bytearray:
+    """Encode values of the datapoints into v3 payload."""
+    return _encode_datapoints(datapoints, _HEADER_V3)
+
+
+def encode_datapoints_v4(datapoints: Iterable[TuyaBLEDataPoint]) -> bytearray:
+    """Encode values of the datapoints into v4 payload."""
+    return _encode_datapoints(datapoints, _HEADER_V4)
@@ -15,6 +15,26 @@ MANUFACTURER_DATA_ID = 0x07D0
 
 RESPONSE_WAIT_TIMEOUT = 60
 
+# Echo of written datapoint is expected from device within the timeout
+ACK_TIMEOUT = 1.0
+ACK_RESYNCS = 2
+
+# Datapoint updates received within the window are passed to callbacks at once
+DATAPOINTS_BATCH_WINDOW = 0.005
+
+# Count of distinct raw values decoded by a raw schema kept in its cache
+RAW_SCHEMA_CACHE_SIZE = 16
+
+# Fragments of a notification received out of order are kept for reassembly
+REORDER_WINDOW = 8
+REORDER_TIMEOUT = 5.0
+
+# Count of recent device sequence numbers checked for retransmitted messages
+DUPLICATES_WINDOW = 16
+
+# Credentials are refreshed after pairing was rejected, at most once per interval
+CREDENTIALS_REFRESH_INTERVAL = 5 * 60
+
 
 class TuyaBLECode(Enum):
     FUN_SENDER_DEVICE_INFO = 0x0000
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Hashable
+
+
+class TuyaBLERecentlySeen:
+    """Window of the sequence numbers or messages seen recently."""
+
+    def __init__(self, size: int) -> None:
+        self._order: deque[Hashable] = deque()
+        self._seen: set[Hashable] = set()
+        self._size = size
+
+    def add(self, key: Hashable) -> bool:
+        """Remember the key, returns True if it is already in the window."""
+        if key in self._seen:
+            return True
+        if len(self._order) >= self._size:
+            self._seen.discard(self._order.popleft())
+        self._order.append(key)
+        self._seen.add(key)
+        return False
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._seen.clear()
@@ -33,6 +33,20 @@ class TuyaBLEDataLengthError(TuyaBLEError):
         super().__init__("Incoming packet has invalid length")
 
 
+class TuyaBLERawValueError(TuyaBLEError):
+    """Raised when field of raw datapoint record does not fit its format."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__("Raw datapoint value cannot be encoded: %s" % (reason))
+
+
+class TuyaBLEResponseTimeoutError(TuyaBLEError):
+    """Raised when Tuya BLE device did not respond to command in time."""
+
+    def __init__(self) -> None:
+        super().__init__("BLE device did not respond in time")
+
+
 class TuyaBLEDeviceError(TuyaBLEError):
     """Raised when Tuya BLE device returned error in response to command."""
 
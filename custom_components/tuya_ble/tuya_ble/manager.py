@@ -46,6 +46,17 @@ class AbstaractTuyaBLEDeviceManager(ABC):
         """Get credentials of the Tuya BLE device."""
         pass
 
+    async def refresh_device_credentials(
+        self,
+        address: str,
+    ) -> TuyaBLEDeviceCredentials | None:
+        """Refresh credentials of the Tuya BLE device.
+
+        Called when the device rejects pairing, i.e. the local key was
+        changed after the device was re-paired in the mobile application.
+        """
+        return await self.get_device_credentials(address, True)
+
     @classmethod
     def check_and_create_device_credentials(
         self,
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from .manager import AbstaractTuyaBLEDeviceManager, TuyaBLEDeviceCredentials
+
+CREDENTIALS_ADDRESS = "address"
+CREDENTIALS_FIELDS = (
+    "uuid",
+    "local_key",
+    "device_id",
+    "category",
+    "product_id",
+    "device_name",
+    "product_model",
+    "product_name",
+)
+CREDENTIALS_REQUIRED_FIELDS = (
+    "uuid",
+    "local_key",
+    "device_id",
+    "category",
+    "product_id",
+)
+
+
+def normalize_address(address: str) -> str:
+    return address.replace("-", ":").upper()
+
+
+def _record_to_credentials(
+    record: dict[str, Any] | None
+) -> TuyaBLEDeviceCredentials | None:
+    if record is None:
+        return None
+    for key in CREDENTIALS_REQUIRED_FIELDS:
+        if not record.get(key):
+            return None
+    return TuyaBLEDeviceCredentials(
+        *(record.get(key) for key in CREDENTIALS_FIELDS)
+    )
+
+
+def _normalize_record(record: dict[str, Any]) -> tuple[str, dict[str, Any]] | None:
+    address = record.get(CREDENTIALS_ADDRESS)
+    if not address or _record_to_credentials(record) is None:
+        return None
+    address = normalize_address(address)
+    result = {key: record.get(key) for key in CREDENTIALS_FIELDS}
+    result[CREDENTIALS_ADDRESS] = address
+    return (address, result)
+
+
+class TuyaBLEFileDeviceManager(AbstaractTuyaBLEDeviceManager):
+    """Manager of the Tuya BLE devices credentials stored in a JSON or CSV file.
+
+    The file is loaded once into an index by address. JSON file contains
+    a list of records or a dictionary of records keyed by address, CSV file
+    has a header row with the names of record fields. Imported records are
+    kept over reloads of the file until they are saved.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self._path = path
+        self._records: dict[str, dict[str, Any]] = {}
+        self._unsaved: dict[str, dict[str, Any]] = {}
+        self._loaded = path is None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _read_file(path: str) -> list[dict[str, Any]]:
+        if not os.path.exists(path):
+            return []
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as file:
+                return list(csv.DictReader(file))
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            return [
+                {CREDENTIALS_ADDRESS: address, **record}
+                for address, record in data.items()
+            ]
+        return list(data)
+
+    @staticmethod
+    def _write_file(path: str, records: list[dict[str, Any]]) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+            if path.lower().endswith(".csv"):
+                writer = csv.DictWriter(
+                    file, fieldnames=(CREDENTIALS_ADDRESS, *CREDENTIALS_FIELDS)
+                )
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                json.dump(records, file, indent=2)
+        os.replace(tmp_path, path)
+
+    async def load(self, force: bool = False) -> None:
+        """Load credentials file into the index."""
+        async with self._lock:
+            if self._loaded and not force:
+                return
+            if self._path:
+                records = await asyncio.get_running_loop().run_in_executor(
+                    None, self._read_file, self._path
+                )
+                self._records.clear()
+                self._add_records(records)
+                self._records.update(self._unsaved)
+            self._loaded = True
+
+    async def save(self) -> None:
+        """Write the index back to the credentials file."""
+        async with self._lock:
+            if self._path:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write_file, self._path, list(self._records.values())
+                )
+            self._unsaved.clear()
+
+    def _add_records(
+        self,
+        records: Iterable[dict[str, Any]],
+        unsaved: dict[str, dict[str, Any]] | None = None,
+    ) -> int:
+        count = 0
+        for record in records:
+            item = _normalize_record(record)
+            if item:
+                self._records[item[0]] = item[1]
+                if unsaved is not None:
+                    unsaved[item[0]] = item[1]
+                count += 1
+        return count
+
+    async def import_records(self, records: Iterable[dict[str, Any]]) -> int:
+        """Add credentials records to the index, returns count of added records."""
+        async with self._lock:
+            return self._add_records(records, self._unsaved)
+
+    async def get_device_credentials(
+        self,
+        address: str,
+        force_update: bool = False,
+        save_data: bool = False,
+    ) -> TuyaBLEDeviceCredentials | None:
+        """Get credentials of the Tuya BLE device."""
+        await self.load(force_update)
+        return _record_to_credentials(self._records.get(normalize_address(address)))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class TuyaBLESQLiteDeviceManager(AbstaractTuyaBLEDeviceManager):
+    """Manager of the Tuya BLE devices credentials stored in SQLite database."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS credentials ("
+                "address TEXT PRIMARY KEY NOT NULL, %s)"
+                % (", ".join("%s TEXT" % key for key in CREDENTIALS_FIELDS))
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _fetch(self, address: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT %s FROM credentials WHERE address = ?"
+                    % (", ".join(CREDENTIALS_FIELDS)),
+                    (address,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        return dict(zip(CREDENTIALS_FIELDS, row))
+
+    def _import(self, records: list[dict[str, Any]]) -> int:
+        rows = []
+        for record in records:
+            item = _normalize_record(record)
+            if item:
+                rows.append(
+                    (item[0], *(item[1].get(key) for key in CREDENTIALS_FIELDS))
+                )
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO credentials (address, %s) "
+                    "VALUES (?, %s)"
+                    % (
+                        ", ".join(CREDENTIALS_FIELDS),
+                        ", ".join("?" for _ in CREDENTIALS_FIELDS),
+                    ),
+                    rows,
+                )
+        return len(rows)
+
+    async def import_records(self, records: Iterable[dict[str, Any]]) -> int:
+        """Add credentials records in a single transaction."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._import, list(records)
+        )
+
+    async def get_device_credentials(
+        self,
+        address: str,
+        force_update: bool = False,
+        save_data: bool = False,
+    ) -> TuyaBLEDeviceCredentials | None:
+        """Get credentials of the Tuya BLE device."""
+        record = await asyncio.get_running_loop().run_in_executor(
+            None, self._fetch, normalize_address(address)
+        )
+        return _record_to_credentials(record)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
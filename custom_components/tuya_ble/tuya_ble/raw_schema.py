@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from struct import Struct, error as StructError
+from typing import Any
+
+from .const import RAW_SCHEMA_CACHE_SIZE
+from .exceptions import TuyaBLEDataLengthError, TuyaBLERawValueError
+
+
+@dataclass(frozen=True)
+class TuyaBLERawBitfield:
+    """Bits of an integer field, decoded as bool when single bit wide."""
+
+    name: str
+    shift: int
+    width: int = 1
+
+
+@dataclass(frozen=True)
+class TuyaBLERawField:
+    """Field of a raw datapoint, format is a struct format character.
+
+    Field with bitfields is represented by its bitfields only.
+    """
+
+    name: str
+    format: str
+    bitfields: tuple[TuyaBLERawBitfield, ...] = ()
+
+
+@dataclass(frozen=True)
+class TuyaBLERawRecords:
+    """Records repeated after the header, count is held by a header field."""
+
+    name: str
+    count: str
+    fields: tuple[TuyaBLERawField, ...]
+
+
+class _TuyaBLERawLayout:
+    """Precompiled struct and record type of a sequence of fields."""
+
+    def __init__(
+        self,
+        type_name: str,
+        fields: Sequence[TuyaBLERawField],
+        byteorder: str,
+        extra_names: Sequence[str] = (),
+    ) -> None:
+        self.struct = Struct(byteorder + "".join(field.format for field in fields))
+        names: list[str] = []
+        decoders: list[Callable[[Any], tuple[Any, ...]]] = []
+        encoders: list[Callable[[Any], Any]] = []
+        for field in fields:
+            if field.bitfields:
+                names.extend(bitfield.name for bitfield in field.bitfields)
+                decoders.append(self._compile_bits_decoder(field.bitfields))
+                encoders.append(self._compile_bits_encoder(field.bitfields))
+            else:
+                names.append(field.name)
+                decoders.append(lambda value: (value,))
+                encoders.append(
+                    lambda record, name=field.name: getattr(record, name)
+                )
+        self.record_type = namedtuple(type_name, [*names, *extra_names])
+        self._decoders = decoders
+        self._encoders = encoders
+
+    @staticmethod
+    def _compile_bits_decoder(
+        bitfields: Sequence[TuyaBLERawBitfield],
+    ) -> Callable[[int], tuple[Any, ...]]:
+        parts = [
+            (bitfield.shift, (1 << bitfield.width) - 1, bitfield.width == 1)
+            for bitfield in bitfields
+        ]
+
+        def _decode(value: int) -> tuple[Any, ...]:
+            return tuple(
+                bool(value >> shift & mask) if flag else value >> shift & mask
+                for shift, mask, flag in parts
+            )
+
+        return _decode
+
+    @staticmethod
+    def _compile_bits_encoder(
+        bitfields: Sequence[TuyaBLERawBitfield],
+    ) -> Callable[[Any], int]:
+        parts = [
+            (bitfield.name, bitfield.shift, (1 << bitfield.width) - 1)
+            for bitfield in bitfields
+        ]
+
+        def _encode(record: Any) -> int:
+            result = 0
+            for name, shift, mask in parts:
+                result |= (int(getattr(record, name)) & mask) << shift
+            return result
+
+        return _encode
+
+    def decode(self, values: tuple[Any, ...]) -> list[Any]:
+        result: list[Any] = []
+        for decoder, value in zip(self._decoders, values):
+            result.extend(decoder(value))
+        return result
+
+    def encode(self, record: Any) -> tuple[Any, ...]:
+        return tuple(encoder(record) for encoder in self._encoders)
+
+
+class TuyaBLERawSchema:
+    """Layout of a structured raw datapoint: header and counted records.
+
+    The schema is compiled once into struct decoders and encoders, decoded
+    records are named tuples and decoding of recent raw values is cached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        header: Sequence[TuyaBLERawField],
+        records: TuyaBLERawRecords | None = None,
+        byteorder: str = ">",
+    ) -> None:
+        self._records = records
+        self._header = _TuyaBLERawLayout(
+            name,
+            header,
+            byteorder,
+            (records.name,) if records is not None else (),
+        )
+        self._record: _TuyaBLERawLayout | None = None
+        self._count_index = 0
+        if records is not None:
+            self._record = _TuyaBLERawLayout(
+                name + "_" + records.name, records.fields, byteorder
+            )
+            self._count_index = self._header.record_type._fields.index(
+                records.count
+            )
+        self.decode: Callable[[bytes], Any] = lru_cache(RAW_SCHEMA_CACHE_SIZE)(
+            self._decode
+        )
+
+    @property
+    def record_type(self) -> type:
+        return self._header.record_type
+
+    def _decode(self, value: bytes) -> Any:
+        header_struct = self._header.struct
+        try:
+            values = self._header.decode(header_struct.unpack_from(value))
+            if self._record is not None:
+                record_struct = self._record.struct
+                start = header_struct.size
+                end = start + values[self._count_index] * record_struct.size
+                if end > len(value):
+                    raise TuyaBLEDataLengthError()
+                record_type = self._record.record_type
+                values.append(
+                    tuple(
+                        record_type(*self._record.decode(record))
+                        for record in record_struct.iter_unpack(
+                            memoryview(value)[start:end]
+                        )
+                    )
+                )
+        except StructError as ex:
+            raise TuyaBLEDataLengthError() from ex
+        return self._header.record_type(*values)
+
+    def encode(self, record: Any) -> bytes:
+        """Encode the record, count of the records is set from their number."""
+        try:
+            if self._records is None or self._record is None:
+                return self._header.struct.pack(*self._header.encode(record))
+            records = getattr(record, self._records.name)
+            record = record._replace(**{self._records.count: len(records)})
+            record_struct = self._record.struct
+            header = self._header.struct.pack(*self._header.encode(record))
+            return header + b"".join(
+                record_struct.pack(*self._record.encode(item)) for item in records
+            )
+        except StructError as ex:
+            raise TuyaBLERawValueError(str(ex)) from ex
+
+    def _size(self, record: Any) -> int:
+        size = self._header.struct.size
+        if self._records is not None and self._record is not None:
+            count = len(getattr(record, self._records.name))
+            size += count * self._record.struct.size
+        return size
+
+    def make(self, **values: Any) -> Any:
+        """Create a record, i.e. to be encoded for a new datapoint."""
+        if self._records is not None:
+            values.setdefault(self._records.count, 0)
+            values.setdefault(self._records.name, ())
+        return self._header.record_type(**values)
+
+    def make_record(self, **values: Any) -> Any:
+        """Create one of the repeated records."""
+        if self._record is None:
+            raise TypeError("Schema has no repeated records")
+        return self._record.record_type(**values)
+
+    def update(self, value: bytes, **values: Any) -> bytes:
+        """Encode the raw value with some of its fields replaced.
+
+        Bytes following the fields known to the schema are kept.
+        """
+        record = self.decode(value)
+        return self.encode(record._replace(**values)) + value[self._size(record) :]
@@ -23,16 +23,30 @@ from bleak_retry_connector import (
 )
 from Crypto.Cipher import AES
 
+from .ack_tracker import TuyaBLEAckStats, TuyaBLEAckTracker
+from .codec import (
+    encode_datapoints_v3,
+    encode_datapoints_v4,
+    encode_value,
+    parse_datapoints_v3,
+    parse_datapoints_v4,
+)
 from .const import (
     CHARACTERISTIC_NOTIFY,
     CHARACTERISTIC_WRITE,
+    CREDENTIALS_REFRESH_INTERVAL,
+    DATAPOINTS_BATCH_WINDOW,
+    DUPLICATES_WINDOW,
     GATT_MTU,
     MANUFACTURER_DATA_ID,
+    REORDER_TIMEOUT,
+    REORDER_WINDOW,
     RESPONSE_WAIT_TIMEOUT,
     SERVICE_UUID,
     TuyaBLECode,
     TuyaBLEDataPointType,
 )
+from .duplicates import TuyaBLERecentlySeen
 from .exceptions import (
     TuyaBLEError,
     TuyaBLEDataCRCError,
@@ -40,6 +54,7 @@ from .exceptions import (
     TuyaBLEDataLengthError,
     TuyaBLEDeviceError,
     TuyaBLEEnumValueError,
+    TuyaBLEResponseTimeoutError,
 )
 from .manager import AbstaractTuyaBLEDeviceManager, TuyaBLEDeviceCredentials
 
@@ -49,7 +64,37 @@ _LOGGER = logging.getLogger(__name__)
 BLEAK_EXCEPTIONS = (*BLEAK_RETRY_EXCEPTIONS, OSError)
 
 
+class _TuyaBLEEditBatch:
+    """Partial edits of a datapoint sent together in one write."""
+
+    __slots__ = ("edits", "callbacks", "done")
+
+    def __init__(self) -> None:
+        self.edits: list[Callable[[bytes], bytes]] = []
+        self.callbacks: list[Callable[[], None]] = []
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def on_assigned(self) -> None:
+        for callback in self.callbacks:
+            callback()
+
+
 class TuyaBLEDataPoint:
+    # Devices are managed by hundreds, keep datapoints without __dict__
+    __slots__ = (
+        "_owner",
+        "_id",
+        "_timestamp",
+        "_flags",
+        "_type",
+        "_value",
+        "_changed_by_device",
+        "_write_pending",
+        "_track_echo",
+        "_edit_batch",
+        "_edit_writer",
+    )
+
     def __init__(
         self,
         owner: TuyaBLEDataPoints,
@@ -63,6 +108,10 @@ class TuyaBLEDataPoint:
         self._id = id
         self._value = value
         self._changed_by_device = False
+        self._write_pending = False
+        self._track_echo = True
+        self._edit_batch: _TuyaBLEEditBatch | None = None
+        self._edit_writer: asyncio.Task | None = None
         self._update_from_device(timestamp, flags, type, value)
 
     def __repr__(self) -> str:
@@ -79,25 +128,12 @@ class TuyaBLEDataPoint:
         self._flags = flags
         self._type = type
         self._changed_by_device = self._value != value
+        # Any report confirms the write, the device may echo the same value.
+        self._write_pending = False
         self._value = value
 
     def _get_value(self) -> bytes:
-        match self._type:
-            case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
-                return self._value
-            case TuyaBLEDataPointType.DT_BOOL:
-                return pack(">B", 1 if self._value else 0)
-            case TuyaBLEDataPointType.DT_VALUE:
-                return pack(">i", self._value)
-            case TuyaBLEDataPointType.DT_ENUM:
-                if self._value > 0xFFFF:
-                    return pack(">I", self._value)
-                elif self._value > 0xFF:
-                    return pack(">H", self._value)
-                else:
-                    return pack(">B", self._value)
-            case TuyaBLEDataPointType.DT_STRING:
-                return self._value.encode()
+        return encode_value(self._type, self._value)
 
     @property
     def id(self) -> int:
@@ -123,7 +159,16 @@ class TuyaBLEDataPoint:
     def changed_by_device(self) -> bool:
         return self._changed_by_device
 
-    async def set_value(self, value: bytes | bool | int | str) -> None:
+    @property
+    def write_pending(self) -> bool:
+        """The value was set and the device has not reported it since."""
+        return self._write_pending
+
+    @property
+    def track_echo(self) -> bool:
+        return self._track_echo
+
+    def _assign_value(self, value: bytes | bool | int | str) -> None:
         match self._type:
             case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
                 self._value = bytes(value)
@@ -141,8 +186,97 @@ class TuyaBLEDataPoint:
             case TuyaBLEDataPointType.DT_STRING:
                 self._value = str(value)
 
+    async def set_value(
+        self,
+        value: bytes | bool | int | str,
+        on_assigned: Callable[[], None] | None = None,
+        track_echo: bool = True,
+    ) -> None:
+        """Set the value and send it to the device.
+
+        on_assigned is called once the local value is set, before it is sent.
+        The previous value is restored when sending fails. Echo of the value
+        is awaited from the device unless track_echo is False, which suits
+        write-only datapoints like buttons.
+        """
+        previous = self._value
+        changed_by_device = self._changed_by_device
+        write_pending = self._write_pending
+        self._assign_value(value)
         self._changed_by_device = False
-        await self._owner._update_from_user(self._id)
+        self._write_pending = True
+        self._track_echo = track_echo
+        if on_assigned is not None:
+            on_assigned()
+        try:
+            await self._owner._update_from_user(self._id)
+        except BaseException:
+            self._value = previous
+            self._changed_by_device = changed_by_device
+            self._write_pending = write_pending
+            raise
+
+    async def update_value(
+        self,
+        edit: Callable[[bytes], bytes],
+        on_assigned: Callable[[], None] | None = None,
+    ) -> None:
+        """Apply a partial edit to the raw or bitmap value and send it.
+
+        Edits made while the previous write of the datapoint is in progress
+        are merged into the next single write, each one applied in order to
+        the latest known bytes.
+        """
+        batch = self._edit_batch
+        if batch is None:
+            batch = self._edit_batch = _TuyaBLEEditBatch()
+        batch.edits.append(edit)
+        if on_assigned is not None:
+            batch.callbacks.append(on_assigned)
+        if self._edit_writer is None:
+            self._edit_writer = asyncio.create_task(self._write_edits())
+        await asyncio.shield(batch.done)
+
+    async def _write_edits(self) -> None:
+        try:
+            # Let the edits made in the same loop iteration join the write.
+            await asyncio.sleep(0)
+            while (batch := self._edit_batch) is not None:
+                self._edit_batch = None
+                try:
+                    value = bytes(self._value)
+                    for edit in batch.edits:
+                        value = edit(value)
+                    if len(batch.edits) > 1:
+                        _LOGGER.debug(
+                            "%s: Merged %s edits of datapoint %s",
+                            self._owner._owner.address,
+                            len(batch.edits),
+                            self._id,
+                        )
+                    await self.set_value(value, batch.on_assigned)
+                except asyncio.CancelledError:
+                    batch.done.cancel()
+                    raise
+                except Exception as ex:
+                    batch.done.set_exception(ex)
+                    # Retrieved by the callers, unless all of them are gone.
+                    batch.done.exception()
+                else:
+                    batch.done.set_result(None)
+        finally:
+            self._edit_writer = None
+
+    def rollback(self, value: bytes | bool | int | str) -> bool:
+        """Restore the value if the device has not reported any since it was set.
+
+        Nothing is sent to the device, returns True if the value was restored.
+        """
+        if not self._write_pending:
+            return False
+        self._assign_value(value)
+        self._write_pending = False
+        return True
 
 
 class TuyaBLEDataPoints:
@@ -167,9 +301,8 @@ class TuyaBLEDataPoints:
         return self._last_data_received
 
     def has_id(self, id: int, type: TuyaBLEDataPointType | None = None) -> bool:
-        return (id in self._datapoints) and (
-            (type is None) or (self._datapoints[id].type == type)
-        )
+        datapoint = self._datapoints.get(id)
+        return datapoint is not None and (type is None or datapoint._type == type)
 
     def get_or_create(
         self,
@@ -184,6 +317,48 @@ class TuyaBLEDataPoints:
         self._datapoints[id] = datapoint
         return datapoint
 
+    def get_snapshot(self) -> list[dict[str, Any]]:
+        """Returns datapoints as JSON serializable records."""
+        return [
+            {
+                "id": datapoint.id,
+                "type": datapoint.type.value,
+                "flags": datapoint.flags,
+                "timestamp": datapoint.timestamp,
+                "value": (
+                    datapoint.value.hex()
+                    if isinstance(datapoint.value, bytes)
+                    else datapoint.value
+                ),
+            }
+            for datapoint in self._datapoints.values()
+        ]
+
+    def restore_snapshot(self, records: list[dict[str, Any]]) -> int:
+        """Restores datapoints not received from device yet from the records."""
+        count = 0
+        for record in records:
+            try:
+                dp_id = int(record["id"])
+                type = TuyaBLEDataPointType(record["type"])
+                timestamp = float(record["timestamp"])
+                flags = int(record.get("flags", 0))
+                value = record["value"]
+                if type in (
+                    TuyaBLEDataPointType.DT_RAW,
+                    TuyaBLEDataPointType.DT_BITMAP,
+                ):
+                    value = bytes.fromhex(value)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if dp_id in self._datapoints:
+                continue
+            self._datapoints[dp_id] = TuyaBLEDataPoint(
+                self, dp_id, timestamp, flags, type, value
+            )
+            count += 1
+        return count
+
     def begin_update(self) -> None:
         self._update_started += 1
 
@@ -201,15 +376,15 @@ class TuyaBLEDataPoints:
         flags: int,
         type: TuyaBLEDataPointType,
         value: bytes | bool | int | str,
-    ) -> None:
+    ) -> TuyaBLEDataPoint:
         self._last_data_received = datetime.now(timezone.utc)
         dp = self._datapoints.get(dp_id)
         if dp:
             dp._update_from_device(timestamp, flags, type, value)
         else:
-            self._datapoints[dp_id] = TuyaBLEDataPoint(
-                self, dp_id, timestamp, flags, type, value
-            )
+            dp = TuyaBLEDataPoint(self, dp_id, timestamp, flags, type, value)
+            self._datapoints[dp_id] = dp
+        return dp
 
     async def _update_from_user(self, dp_id: int) -> None:
         if self._update_started > 0:
@@ -229,6 +404,7 @@ class TuyaBLEDevice:
         device_manager: AbstaractTuyaBLEDeviceManager,
         ble_device: BLEDevice,
         advertisement_data: AdvertisementData | None = None,
+        datapoints_batch_window: float = DATAPOINTS_BATCH_WINDOW,
     ) -> None:
         """Init the TuyaBLE."""
         self._device_manager = device_manager
@@ -244,6 +420,11 @@ class TuyaBLEDevice:
         self._disconnected_callbacks: list[Callable[[], None]] = []
         self._current_seq_num = 1
         self._seq_num_lock = asyncio.Lock()
+        self._dp_seq_num = 0
+        # Device resends reports whose acknowledgement was lost
+        self._seen_seq_nums = TuyaBLERecentlySeen(DUPLICATES_WINDOW)
+        self._seen_dp_reports = TuyaBLERecentlySeen(DUPLICATES_WINDOW)
+        self._duplicate_reports = 0
 
         self._is_bound = False
         self._flags = 0
@@ -261,14 +442,26 @@ class TuyaBLEDevice:
         self._session_key: bytes | None = None
 
         self._is_paired = False
+        self._credentials_refreshed: float | None = None
+        self._credentials_refresh: asyncio.Task | None = None
 
         self._input_buffer: bytearray | None = None
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
+        # Fragments received ahead of the expected one, by packet number
+        self._input_fragments: dict[int, bytes] = {}
+        self._input_reordered = False
+        self._input_timeout: asyncio.TimerHandle | None = None
+        self._reordered_messages = 0
+        self._abandoned_messages = 0
         self._input_expected_responses: dict[int, asyncio.Future[int] | None] = {}
         # self._input_future: asyncio.Future[int] | None = None
 
         self._datapoints = TuyaBLEDataPoints(self)
+        self._datapoints_batch_window = datapoints_batch_window
+        self._batched_datapoints: dict[int, TuyaBLEDataPoint] = {}
+        self._batch_handle: asyncio.TimerHandle | None = None
+        self._ack_tracker = TuyaBLEAckTracker(ble_device.address, self.update)
 
     def set_ble_device_and_advertisement_data(
         self, ble_device: BLEDevice, advertisement_data: AdvertisementData
@@ -307,18 +500,66 @@ class TuyaBLEDevice:
         _LOGGER.debug("%s: Updating", self.address)
         await self._send_packet(TuyaBLECode.FUN_SENDER_DEVICE_STATUS, bytes())
 
+    def _set_device_info(self, device_info: TuyaBLEDeviceCredentials) -> None:
+        self._device_info = device_info
+        self._local_key = device_info.local_key[:6].encode()
+        self._login_key = hashlib.md5(self._local_key).digest()
+
     async def _update_device_info(self) -> bool:
         if self._device_info is None:
+            device_info: TuyaBLEDeviceCredentials | None = None
             if self._device_manager:
-                self._device_info = await self._device_manager.get_device_credentials(
+                device_info = await self._device_manager.get_device_credentials(
                     self._ble_device.address, False
                 )
-            if self._device_info:
-                self._local_key = self._device_info.local_key[:6].encode()
-                self._login_key = hashlib.md5(self._local_key).digest()
+            if device_info:
+                self._set_device_info(device_info)
 
         return self._device_info is not None
 
+    def _handle_pairing_rejected(self) -> None:
+        """Refresh credentials in background when device rejects the pairing.
+
+        Pairing is rejected when the local key was changed after the device
+        was re-paired in the mobile application, so the credentials of
+        this single device are requested from the device manager again
+        while the connection attempts go on.
+        """
+        if not self._device_manager:
+            return
+        if self._credentials_refresh is not None:
+            return
+        if (
+            self._credentials_refreshed is not None
+            and time.monotonic() - self._credentials_refreshed
+            < CREDENTIALS_REFRESH_INTERVAL
+        ):
+            return
+        self._credentials_refreshed = time.monotonic()
+        self._credentials_refresh = asyncio.create_task(
+            self._async_refresh_credentials()
+        )
+
+    async def _async_refresh_credentials(self) -> None:
+        _LOGGER.debug("%s: Pairing rejected, refreshing credentials", self.address)
+        try:
+            device_info = await self._device_manager.refresh_device_credentials(
+                self.address
+            )
+        except Exception:
+            _LOGGER.error(
+                "%s: Refreshing credentials failed", self.address, exc_info=True
+            )
+            return
+        finally:
+            self._credentials_refresh = None
+        if device_info and (
+            self._device_info is None
+            or device_info.local_key != self._device_info.local_key
+        ):
+            _LOGGER.info("%s: Local key was changed, retrying", self.address)
+            self._set_device_info(device_info)
+
     def _decode_advertisement_data(self) -> None:
         raw_product_id: bytes | None = None
         # raw_product_key: bytes | None = None
@@ -458,7 +699,7 @@ class TuyaBLEDevice:
 
     def _fire_connected_callbacks(self) -> None:
         """Fire the callbacks."""
-        for callback in self._connected_callbacks:
+        for callback in self._connected_callbacks.copy():
             callback()
 
     def register_connected_callback(
@@ -477,6 +718,57 @@ class TuyaBLEDevice:
         for callback in self._callbacks:
             callback(datapoints)
 
+    def _queue_callbacks(self, datapoints: list[TuyaBLEDataPoint]) -> None:
+        """Merge updates arriving within the batch window into one callback."""
+        if self._datapoints_batch_window <= 0:
+            self._fire_callbacks(datapoints)
+            return
+        for datapoint in datapoints:
+            self._batched_datapoints[datapoint.id] = datapoint
+        if self._batch_handle is None:
+            self._batch_handle = asyncio.get_running_loop().call_later(
+                self._datapoints_batch_window, self._flush_callbacks
+            )
+
+    def _flush_callbacks(self) -> None:
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+        if self._batched_datapoints:
+            datapoints = list(self._batched_datapoints.values())
+            self._batched_datapoints.clear()
+            self._fire_callbacks(datapoints)
+
+    @property
+    def reordered_messages(self) -> int:
+        """Count of messages assembled from fragments received out of order."""
+        return self._reordered_messages
+
+    @property
+    def abandoned_messages(self) -> int:
+        """Count of messages given up with fragments missing."""
+        return self._abandoned_messages
+
+    @property
+    def duplicate_reports(self) -> int:
+        """Count of retransmitted datapoint reports ignored."""
+        return self._duplicate_reports
+
+    @property
+    def ack_stats(self) -> TuyaBLEAckStats:
+        """Statistics of datapoint echoes, i.e. command latency."""
+        return self._ack_tracker.stats
+
+    @property
+    def datapoints_batch_window(self) -> float:
+        return self._datapoints_batch_window
+
+    @datapoints_batch_window.setter
+    def datapoints_batch_window(self, value: float) -> None:
+        self._datapoints_batch_window = value
+        if value <= 0:
+            self._flush_callbacks()
+
     def register_callback(
         self,
         callback: Callable[[list[TuyaBLEDataPoint]], None],
@@ -513,6 +805,12 @@ class TuyaBLEDevice:
     async def stop(self) -> None:
         """Stop the TuyaBLE."""
         _LOGGER.debug("%s: Stop", self.address)
+        self._flush_callbacks()
+        self._ack_tracker.clear()
+        self._clean_input()
+        if self._credentials_refresh is not None:
+            self._credentials_refresh.cancel()
+            self._credentials_refresh = None
         await self._execute_disconnect()
 
     def _disconnected(self, client: BleakClientWithServiceCache) -> None:
@@ -564,6 +862,7 @@ class TuyaBLEDevice:
                 await client.disconnect()
         async with self._seq_num_lock:
             self._current_seq_num = 1
+        self._clean_seen_seq_nums()
 
     async def _ensure_connected(self) -> None:
         """Ensure connection to device is established."""
@@ -683,6 +982,15 @@ class TuyaBLEDevice:
                                 self.address,
                             )
                             continue
+                    except TuyaBLEDeviceError:
+                        self._client = None
+                        _LOGGER.error(
+                            "%s: Pairing request rejected by device",
+                            self.address,
+                            exc_info=True,
+                        )
+                        self._handle_pairing_rejected()
+                        continue
                     except:  # [BLEAK_EXCEPTIONS, BleakNotFoundError]:
                         self._client = None
                         _LOGGER.error(
@@ -713,6 +1021,7 @@ class TuyaBLEDevice:
         _LOGGER.debug("%s: Reconnect, ensuring connection", self.address)
         async with self._seq_num_lock:
             self._current_seq_num = 1
+        self._clean_seen_seq_nums()
         try:
             if self._expected_disconnect:
                 return
@@ -837,14 +1146,16 @@ class TuyaBLEDevice:
         data: bytes,
         wait_for_response: bool = True,
         # retry: int | None = None,
-    ) -> None:
+    ) -> bool:
         """Send packet to device and optional read response."""
         if self._expected_disconnect:
-            return
+            return False
         await self._ensure_connected()
         if self._expected_disconnect:
-            return
-        await self._send_packet_while_connected(code, data, 0, wait_for_response)
+            return False
+        return await self._send_packet_while_connected(
+            code, data, 0, wait_for_response
+        )
 
     async def _send_response(
         self,
@@ -1045,46 +1356,80 @@ class TuyaBLEDevice:
 
     def _parse_datapoints_v3(
         self, timestamp: float, flags: int, data: bytes, start_pos: int
-    ) -> int:
-        datapoints: list[TuyaBLEDataPoint] = []
+    ) -> None:
+        self._parse_datapoints(
+            parse_datapoints_v3, timestamp, flags, data, start_pos
+        )
 
-        pos = start_pos
-        while len(data) - pos >= 4:
-            id: int = data[pos]
-            pos += 1
-            _type: int = data[pos]
-            if _type > TuyaBLEDataPointType.DT_BITMAP.value:
-                raise TuyaBLEDataFormatError()
-            type: TuyaBLEDataPointType = TuyaBLEDataPointType(_type)
-            pos += 1
-            data_len: int = data[pos]
-            pos += 1
-            next_pos = pos + data_len
-            if next_pos > len(data):
-                raise TuyaBLEDataLengthError()
-            raw_value = data[pos:next_pos]
-            match type:
-                case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
-                    value = raw_value
-                case TuyaBLEDataPointType.DT_BOOL:
-                    value = int.from_bytes(raw_value, "big") != 0
-                case TuyaBLEDataPointType.DT_VALUE | TuyaBLEDataPointType.DT_ENUM:
-                    value = int.from_bytes(raw_value, "big", signed=True)
-                case TuyaBLEDataPointType.DT_STRING:
-                    value = raw_value.decode()
+    def _parse_datapoints_v4(
+        self, timestamp: float, flags: int, data: bytes, start_pos: int
+    ) -> None:
+        self._parse_datapoints(
+            parse_datapoints_v4, timestamp, flags, data, start_pos
+        )
 
+    def _parse_datapoints(
+        self,
+        parse: Callable[..., list[TuyaBLEDataPoint]],
+        timestamp: float,
+        flags: int,
+        data: bytes,
+        start_pos: int,
+    ) -> None:
+        # Changes of the batched updates not passed to callbacks yet are kept
+        changed = [
+            dp_id
+            for dp_id, datapoint in self._batched_datapoints.items()
+            if datapoint.changed_by_device
+        ]
+        datapoints = parse(self._datapoints, timestamp, flags, data, start_pos)
+        for dp_id in changed:
+            self._datapoints[dp_id]._changed_by_device = True
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            for datapoint in datapoints:
+                _LOGGER.debug(
+                    "%s: Received datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    datapoint.id,
+                    datapoint.type.name,
+                    datapoint.value,
+                )
+
+        self._ack_tracker.handle_datapoints(datapoints)
+        self._queue_callbacks(datapoints)
+
+    def _is_duplicate_report(
+        self,
+        code: TuyaBLECode,
+        seq_num: int,
+        dp_seq_num: int | None = None,
+        data: bytes = b"",
+    ) -> bool:
+        """Check if datapoints report is a resend of already handled one.
+
+        Resent report is acknowledged again, but its datapoints are not parsed.
+        Resend may come with new seq num, so reports having dp seq num are also
+        matched by their payload, which starts with the dp seq num.
+        """
+        duplicate = self._seen_seq_nums.add(seq_num)
+        if dp_seq_num is not None:
+            duplicate = self._seen_dp_reports.add(bytes(data)) or duplicate
+        if duplicate:
+            self._duplicate_reports += 1
             _LOGGER.debug(
-                "%s: Received datapoint update, id: %s, type: %s: value: %s",
+                "%s: Ignoring resent %s #%s, dp seq num %s",
                 self.address,
-                id,
-                type.name,
-                value,
+                code.name,
+                seq_num,
+                dp_seq_num,
             )
-            self._datapoints._update_from_device(id, timestamp, flags, type, value)
-            datapoints.append(self._datapoints[id])
-            pos = next_pos
+        return duplicate
 
-        self._fire_callbacks(datapoints)
+    def _clean_seen_seq_nums(self) -> None:
+        """Sequence numbers of the device start over with new connection."""
+        self._seen_seq_nums.clear()
+        self._seen_dp_reports.clear()
 
     def _handle_command_or_response(
         self, seq_num: int, response_to: int, code: TuyaBLECode, data: bytes
@@ -1154,21 +1499,24 @@ class TuyaBLEDevice:
                 asyncio.create_task(self._send_response(code, data, seq_num))
 
             case TuyaBLECode.FUN_RECEIVE_DP:
-                self._parse_datapoints_v3(time.time(), 0, data, 0)
+                if not self._is_duplicate_report(code, seq_num):
+                    self._parse_datapoints_v3(time.time(), 0, data, 0)
                 asyncio.create_task(self._send_response(code, bytes(0), seq_num))
 
             case TuyaBLECode.FUN_RECEIVE_SIGN_DP:
                 dp_seq_num = int.from_bytes(data[:2], "big")
                 flags = data[2]
-                self._parse_datapoints_v3(time.time(), flags, data, 2)
+                if not self._is_duplicate_report(code, seq_num, dp_seq_num, data):
+                    self._parse_datapoints_v3(time.time(), flags, data, 2)
                 data = pack(">HBB", dp_seq_num, flags, 0)
                 asyncio.create_task(self._send_response(code, data, seq_num))
 
             case TuyaBLECode.FUN_RECEIVE_TIME_DP:
                 timestamp: float
                 pos: int
-                timestamp, pos = self._parse_timestamp(data, 0)
-                self._parse_datapoints_v3(timestamp, 0, data, pos)
+                if not self._is_duplicate_report(code, seq_num):
+                    timestamp, pos = self._parse_timestamp(data, 0)
+                    self._parse_datapoints_v3(timestamp, 0, data, pos)
                 asyncio.create_task(self._send_response(code, bytes(0), seq_num))
 
             case TuyaBLECode.FUN_RECEIVE_SIGN_TIME_DP:
@@ -1176,11 +1524,36 @@ class TuyaBLEDevice:
                 pos: int
                 dp_seq_num = int.from_bytes(data[:2], "big")
                 flags = data[2]
-                timestamp, pos = self._parse_timestamp(data, 3)
-                self._parse_datapoints_v3(time.time(), flags, data, pos)
+                if not self._is_duplicate_report(code, seq_num, dp_seq_num, data):
+                    timestamp, pos = self._parse_timestamp(data, 3)
+                    self._parse_datapoints_v3(time.time(), flags, data, pos)
                 data = pack(">HBB", dp_seq_num, flags, 0)
                 asyncio.create_task(self._send_response(code, data, seq_num))
 
+            case TuyaBLECode.FUN_SENDER_DPS_V4:
+                # version, dp seq num, flags and state of the write
+                if len(data) >= 7:
+                    result = data[6]
+
+            case TuyaBLECode.FUN_RECEIVE_DP_V4:
+                # version, dp seq num, type, mode, ack and datapoints
+                if len(data) < 8:
+                    raise TuyaBLEDataLengthError()
+                dp_seq_num = int.from_bytes(data[1:5], "big")
+                if not self._is_duplicate_report(code, seq_num, dp_seq_num, data):
+                    self._parse_datapoints_v4(time.time(), 0, data, 8)
+                self._send_datapoints_v4_response(code, data, seq_num)
+
+            case TuyaBLECode.FUN_RECEIVE_TIME_DP_V4:
+                # version, dp seq num, type, mode, ack, time and datapoints
+                if len(data) < 8:
+                    raise TuyaBLEDataLengthError()
+                dp_seq_num = int.from_bytes(data[1:5], "big")
+                if not self._is_duplicate_report(code, seq_num, dp_seq_num, data):
+                    timestamp, pos = self._parse_timestamp(data, 8)
+                    self._parse_datapoints_v4(timestamp, 0, data, pos)
+                self._send_datapoints_v4_response(code, data, seq_num)
+
         if response_to != 0:
             future = self._input_expected_responses.pop(response_to, None)
             if future:
@@ -1199,6 +1572,52 @@ class TuyaBLEDevice:
         self._input_buffer = None
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
+        self._input_fragments.clear()
+        self._input_reordered = False
+        if self._input_timeout is not None:
+            self._input_timeout.cancel()
+            self._input_timeout = None
+
+    def _abandon_input(self, reason: str) -> None:
+        if self._input_buffer is not None or self._input_fragments:
+            self._abandoned_messages += 1
+            _LOGGER.error(
+                "%s: Incomplete message in notifications abandoned: %s, "
+                "expected packet %s",
+                self.address,
+                reason,
+                self._input_expected_packet_num,
+            )
+        self._clean_input()
+
+    def _arm_input_timeout(self) -> None:
+        if self._input_timeout is None:
+            self._input_timeout = asyncio.get_running_loop().call_later(
+                REORDER_TIMEOUT, self._input_timed_out
+            )
+
+    def _check_early_fragments(self) -> None:
+        """Drop fragments received before packet 0 not fitting its length.
+
+        Those are late fragments of a message completed before.
+        """
+        length = len(self._input_buffer) + sum(
+            len(fragment) for fragment in self._input_fragments.values()
+        )
+        if length <= self._input_expected_length:
+            return
+        self._abandoned_messages += 1
+        _LOGGER.error(
+            "%s: Stale fragments in notifications dropped: %s",
+            self.address,
+            sorted(self._input_fragments),
+        )
+        self._input_fragments.clear()
+        self._input_reordered = False
+
+    def _input_timed_out(self) -> None:
+        self._input_timeout = None
+        self._abandon_input("timeout")
 
     def _parse_input(self) -> None:
         security_flag = self._input_buffer[0]
@@ -1272,32 +1691,58 @@ class TuyaBLEDevice:
 
         packet_num, pos = self._unpack_int(data, pos)
 
-        if packet_num < self._input_expected_packet_num:
-            _LOGGER.error(
-                "%s: Unexpected packet (number %s) in notifications, " "expected %s",
+        if packet_num == 0:
+            if self._input_buffer is not None:
+                self._abandon_input("new message started")
+            self._input_buffer = bytearray()
+            self._input_expected_length, pos = self._unpack_int(data, pos)
+            pos += 1
+            self._input_buffer += data[pos:]
+            self._input_expected_packet_num = 1
+            if self._input_fragments:
+                self._check_early_fragments()
+        elif packet_num < self._input_expected_packet_num:
+            _LOGGER.debug(
+                "%s: Ignoring repeated packet (number %s) in notifications",
                 self.address,
                 packet_num,
-                self._input_expected_packet_num,
             )
-            self._clean_input()
-
-        if packet_num == self._input_expected_packet_num:
-            if packet_num == 0:
-                self._input_buffer = bytearray()
-                self._input_expected_length, pos = self._unpack_int(data, pos)
-                pos += 1
+            return
+        elif (
+            packet_num == self._input_expected_packet_num
+            and self._input_buffer is not None
+        ):
             self._input_buffer += data[pos:]
             self._input_expected_packet_num += 1
-        else:
-            _LOGGER.error(
-                "%s: Missing packet (number %s) in notifications, received %s",
+        elif (
+            packet_num - self._input_expected_packet_num <= REORDER_WINDOW
+            and (
+                len(self._input_fragments) < REORDER_WINDOW
+                or packet_num in self._input_fragments
+            )
+        ):
+            _LOGGER.debug(
+                "%s: Packet (number %s) in notifications ahead of %s, kept",
                 self.address,
-                self._input_expected_packet_num,
                 packet_num,
+                self._input_expected_packet_num,
             )
-            self._clean_input()
+            self._input_fragments[packet_num] = bytes(data[pos:])
+            self._input_reordered = True
+        else:
+            self._abandon_input("packet %s out of reorder window" % packet_num)
             return
 
+        if self._input_buffer is None:
+            # Fragments received ahead of packet 0 wait for it
+            self._arm_input_timeout()
+            return
+        while self._input_expected_packet_num in self._input_fragments:
+            self._input_buffer += self._input_fragments.pop(
+                self._input_expected_packet_num
+            )
+            self._input_expected_packet_num += 1
+
         if len(self._input_buffer) > self._input_expected_length:
             _LOGGER.error(
                 "%s: Unexpected length of data in notifications, "
@@ -1309,6 +1754,8 @@ class TuyaBLEDevice:
             self._clean_input()
             return
         elif len(self._input_buffer) == self._input_expected_length:
+            if self._input_reordered:
+                self._reordered_messages += 1
             try:
                 self._parse_input()
             except TuyaBLEError as err:
@@ -1320,13 +1767,43 @@ class TuyaBLEDevice:
                 )
                 self._clean_input()
                 return
+        else:
+            # Message is split into packets, wait for the rest of them
+            self._arm_input_timeout()
+
+    def _send_datapoints_v4_response(
+        self, code: TuyaBLECode, data: bytes, seq_num: int
+    ) -> None:
+        # Device asks for the response with zero in ack field
+        if data[7] == 0:
+            response = data[:7] + b"\x00"
+            asyncio.create_task(self._send_response(code, response, seq_num))
 
     async def _send_datapoints_v3(self, datapoint_ids: list[int]) -> None:
         """Send new values of datapoints to the device."""
-        data = bytearray()
-        for dp_id in datapoint_ids:
-            dp = self._datapoints[dp_id]
-            value = dp._get_value()
+        datapoints = [self._datapoints[dp_id] for dp_id in datapoint_ids]
+        await self._send_datapoints_packet(
+            TuyaBLECode.FUN_SENDER_DPS, encode_datapoints_v3(datapoints), datapoints
+        )
+
+    async def _send_datapoints_v4(self, datapoint_ids: list[int]) -> None:
+        """Send new values of datapoints to the device in v4 format."""
+        datapoints = [self._datapoints[dp_id] for dp_id in datapoint_ids]
+        self._dp_seq_num = (self._dp_seq_num + 1) & 0xFFFFFFFF
+        # version, dp seq num and flags precede the datapoints
+        data = bytearray(pack(">BIB", 0, self._dp_seq_num, 0))
+        data += encode_datapoints_v4(datapoints)
+        await self._send_datapoints_packet(
+            TuyaBLECode.FUN_SENDER_DPS_V4, data, datapoints
+        )
+
+    async def _send_datapoints_packet(
+        self,
+        code: TuyaBLECode,
+        data: bytes,
+        datapoints: list[TuyaBLEDataPoint],
+    ) -> None:
+        for dp in datapoints:
             _LOGGER.debug(
                 "%s: Sending datapoint update, id: %s, type: %s: value: %s",
                 self.address,
@@ -1334,14 +1811,22 @@ class TuyaBLEDevice:
                 dp.type.name,
                 dp.value,
             )
-            data += pack(">BBB", dp.id, int(dp.type.value), len(value))
-            data += value
+            if dp.track_echo:
+                self._ack_tracker.track(dp.id)
 
-        await self._send_packet(TuyaBLECode.FUN_SENDER_DPS, data)
+        try:
+            sent = await self._send_packet(code, data)
+        except BaseException:
+            self._ack_tracker.discard(dp.id for dp in datapoints)
+            raise
+        if not sent:
+            raise TuyaBLEResponseTimeoutError()
 
     async def _send_datapoints(self, datapoint_ids: list[int]) -> None:
         """Send new values of datapoints to the device."""
         if self._protocol_version == 3:
             await self._send_datapoints_v3(datapoint_ids)
+        elif self._protocol_version >= 4:
+            await self._send_datapoints_v4(datapoint_ids)
         else:
             raise TuyaBLEDeviceError(0)
@@ -0,0 +1,35 @@
+"""Microbenchmark of the datapoints codec.
+
+Run with: python tests/benchmark_codec.py
+"""
+from __future__ import annotations
+
+import timeit
+
+from test_codec import SAMPLES, DataPoints, codec
+
+NUMBER = 20000
+
+
+def main() -> None:
+    data_v3 = bytes(codec.encode_datapoints_v3(SAMPLES))
+    data_v4 = bytes(codec.encode_datapoints_v4(SAMPLES))
+    datapoints = DataPoints()
+    cases = {
+        "encode v3": lambda: codec.encode_datapoints_v3(SAMPLES),
+        "encode v4": lambda: codec.encode_datapoints_v4(SAMPLES),
+        "parse v3": lambda: codec.parse_datapoints_v3(
+            datapoints, 0.0, 0, data_v3, 0
+        ),
+        "parse v4": lambda: codec.parse_datapoints_v4(
+            datapoints, 0.0, 0, data_v4, 0
+        ),
+    }
+    print("%s datapoints per message, %s runs" % (len(SAMPLES), NUMBER))
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=NUMBER, repeat=5))
+        print("%-10s %8.2f us per message" % (name, best / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Helpers to load modules of the tuya_ble library without bleak."""
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+
+LIBRARY_PATH = (
+    Path(__file__).parent.parent / "custom_components" / "tuya_ble" / "tuya_ble"
+)
+LIBRARY_PACKAGE = "tuya_ble_lib"
+
+
+def load_library_module(name: str) -> ModuleType:
+    """Load a pure Python module of the library, skipping the package init.
+
+    Package init imports the device class, which requires bleak.
+    """
+    if LIBRARY_PACKAGE not in sys.modules:
+        package = ModuleType(LIBRARY_PACKAGE)
+        package.__path__ = [str(LIBRARY_PATH)]
+        sys.modules[LIBRARY_PACKAGE] = package
+    full_name = "%s.%s" % (LIBRARY_PACKAGE, name)
+    module = sys.modules.get(full_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            full_name, LIBRARY_PATH / ("%s.py" % name)
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[full_name] = module
+        spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,117 @@
+"""Tests of the datapoints codec."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from helpers import load_library_module
+
+const = load_library_module("const")
+codec = load_library_module("codec")
+exceptions = load_library_module("exceptions")
+
+DT = const.TuyaBLEDataPointType
+
+
+@dataclass
+class DataPoint:
+    id: int
+    type: Any
+    value: Any
+
+
+class DataPoints:
+    """Collects updates like TuyaBLEDataPoints._update_from_device."""
+
+    def _update_from_device(
+        self, dp_id: int, timestamp: float, flags: int, type: Any, value: Any
+    ) -> DataPoint:
+        return DataPoint(dp_id, type, value)
+
+
+SAMPLES = [
+    DataPoint(1, DT.DT_BOOL, True),
+    DataPoint(2, DT.DT_BOOL, False),
+    DataPoint(3, DT.DT_VALUE, 0),
+    DataPoint(4, DT.DT_VALUE, -1),
+    DataPoint(5, DT.DT_VALUE, 2**31 - 1),
+    DataPoint(6, DT.DT_VALUE, -(2**31)),
+    DataPoint(7, DT.DT_ENUM, 0),
+    DataPoint(8, DT.DT_ENUM, 128),
+    DataPoint(9, DT.DT_ENUM, 200),
+    DataPoint(10, DT.DT_ENUM, 40000),
+    DataPoint(11, DT.DT_ENUM, 2**32 - 1),
+    DataPoint(12, DT.DT_STRING, "Привіт"),
+    DataPoint(13, DT.DT_RAW, b"\x00\x01\xfe\xff"),
+    DataPoint(14, DT.DT_BITMAP, b"\x05"),
+]
+
+
+def _parse(parse: Any, data: bytes, start_pos: int = 0) -> list[DataPoint]:
+    return parse(DataPoints(), 0.0, 0, data, start_pos)
+
+
+@pytest.mark.parametrize(
+    ("encode", "parse"),
+    [
+        (codec.encode_datapoints_v3, codec.parse_datapoints_v3),
+        (codec.encode_datapoints_v4, codec.parse_datapoints_v4),
+    ],
+)
+def test_round_trip(encode: Any, parse: Any) -> None:
+    assert _parse(parse, bytes(encode(SAMPLES))) == SAMPLES
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=lambda sample: str(sample.id))
+def test_value_round_trip(sample: DataPoint) -> None:
+    raw = codec.encode_value(sample.type, sample.value)
+    assert codec.decode_value(sample.type, raw) == sample.value
+
+
+@pytest.mark.parametrize(
+    ("value", "raw"),
+    [
+        (1, b"\x01"),
+        (128, b"\x80"),
+        (200, b"\xc8"),
+        (40000, b"\x9c\x40"),
+        (70000, b"\x00\x01\x11\x70"),
+    ],
+)
+def test_enum_is_unsigned(value: int, raw: bytes) -> None:
+    assert codec.encode_value(DT.DT_ENUM, value) == raw
+    assert codec.decode_value(DT.DT_ENUM, raw) == value
+
+
+def test_parse_v3_layout() -> None:
+    data = b"\xff\xff" + b"\x01\x01\x01\x01" + b"\x02\x02\x04\xff\xff\xff\xfe"
+    assert _parse(codec.parse_datapoints_v3, data, 2) == [
+        DataPoint(1, DT.DT_BOOL, True),
+        DataPoint(2, DT.DT_VALUE, -2),
+    ]
+
+
+def test_parse_v4_layout() -> None:
+    data = b"\x07\x04\x00\x02\x9c\x40"
+    assert _parse(codec.parse_datapoints_v4, data) == [
+        DataPoint(7, DT.DT_ENUM, 40000),
+    ]
+
+
+def test_parse_unknown_type() -> None:
+    with pytest.raises(exceptions.TuyaBLEDataFormatError):
+        _parse(codec.parse_datapoints_v3, b"\x01\x09\x01\x00")
+
+
+@pytest.mark.parametrize(
+    ("parse", "data"),
+    [
+        (codec.parse_datapoints_v3, b"\x01\x00\x05\x00\x01"),
+        (codec.parse_datapoints_v4, b"\x01\x00\x00\x05\x00\x01"),
+    ],
+)
+def test_parse_truncated(parse: Any, data: bytes) -> None:
+    with pytest.raises(exceptions.TuyaBLEDataLengthError):
+        _parse(parse, data)
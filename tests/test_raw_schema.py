@@ -0,0 +1,63 @@
+"""Tests of the raw datapoint schema."""
+from __future__ import annotations
+
+import pytest
+
+from helpers import load_library_module
+
+exceptions = load_library_module("exceptions")
+raw_schema = load_library_module("raw_schema")
+
+PROGRAM_SCHEMA = raw_schema.TuyaBLERawSchema(
+    "program",
+    (
+        raw_schema.TuyaBLERawField("repeat_count", "H"),
+        raw_schema.TuyaBLERawField("idle_position", "B"),
+        raw_schema.TuyaBLERawField("step_count", "B"),
+    ),
+    raw_schema.TuyaBLERawRecords(
+        "steps",
+        "step_count",
+        (
+            raw_schema.TuyaBLERawField("position", "B"),
+            raw_schema.TuyaBLERawField("delay", "H"),
+        ),
+    ),
+)
+PROGRAM = b"\x00\x02\x05\x02" + b"\x64\x01\xf4" + b"\x00\x00\x00"
+
+
+def test_round_trip() -> None:
+    program = PROGRAM_SCHEMA.decode(PROGRAM)
+    assert program.repeat_count == 2
+    assert program.idle_position == 5
+    assert [(step.position, step.delay) for step in program.steps] == [
+        (100, 500),
+        (0, 0),
+    ]
+    assert PROGRAM_SCHEMA.encode(program) == PROGRAM
+
+
+def test_update_keeps_tail() -> None:
+    tail = b"\xaa\xbb"
+    assert PROGRAM_SCHEMA.update(PROGRAM + tail, idle_position=7) == (
+        PROGRAM[:2] + b"\x07" + PROGRAM[3:] + tail
+    )
+
+
+def test_update_records_keeps_tail() -> None:
+    tail = b"\xaa"
+    steps = (PROGRAM_SCHEMA.make_record(position=50, delay=10),)
+    assert PROGRAM_SCHEMA.update(PROGRAM + tail, steps=steps) == (
+        b"\x00\x02\x05\x01\x32\x00\x0a" + tail
+    )
+
+
+def test_encode_out_of_range() -> None:
+    with pytest.raises(exceptions.TuyaBLERawValueError):
+        PROGRAM_SCHEMA.update(PROGRAM, idle_position=256)
+
+
+def test_decode_truncated() -> None:
+    with pytest.raises(exceptions.TuyaBLEDataLengthError):
+        PROGRAM_SCHEMA.decode(PROGRAM[:6])